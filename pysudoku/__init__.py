@@ -1,5 +1,61 @@
-from . import sudoku
-from . import boards 
+import importlib
+
+# Names exported by the package, along with the module each is defined in.
+# Modules are only imported when one of their names is first used, so that
+# importing pysudoku stays cheap for short lived processes.
+_EXPORTS = {
+    'Board': 'board',
+    'Budget': 'budget',
+    'BudgetExceeded': 'budget',
+    'SolutionCache': 'cache',
+    'canonical_form': 'canonical',
+    'Grade': 'grading',
+    'Generator': 'generator',
+    'generate_many': 'generator',
+    'solve_many': 'parallel',
+    'solve_string': 'parallel',
+    'SolverService': 'service',
+    'Stats': 'stats',
+    'SolutionStore': 'store',
+    'write_store': 'store',
+    'read_lines': 'stream',
+    'read_puzzles': 'stream',
+    'write_puzzles': 'stream',
+    'Event': 'trace',
+    'Step': 'trace',
+    'Tracer': 'trace',
+    'validate': 'validation',
+    'validate_many': 'validation',
+}
+
+_SUBMODULES = ('boards', 'sudoku')
+
+__all__ = sorted(list(_EXPORTS) + list(_SUBMODULES) + ['load'])
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    # Any other submodule, such as pysudoku.dlx, is imported on first use
+    # like the exported names
+    if not name.startswith("_"):
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return __all__
+
 
 def load(cells):
-    return sudoku.Sudoku(cells)
+    from .sudoku import Sudoku
+    return Sudoku(cells)
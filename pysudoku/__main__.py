@@ -0,0 +1,342 @@
+import argparse
+import asyncio
+import collections
+import itertools
+import sys
+from . import bench
+from .cache import SolutionCache
+from .generator import DIFFICULTIES, generate_many
+from .grid import parse
+from .parallel import solve_many
+from .service import serve
+from .store import SolutionStore, pack, write_store
+from .stream import read_lines, write_puzzles
+from .validation import validate_many
+
+# Number of puzzles checked at a time by the validate command
+VALIDATE_CHUNKSIZE = 100000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pysudoku")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    solve = commands.add_parser(
+        "solve",
+        help="Solve puzzles given one per line as strings, of 81 characters "
+             "for 9x9 puzzles")
+    solve.add_argument(
+        "input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+        help="File to read puzzles from, defaults to stdin")
+    solve.add_argument(
+        "-o", "--output", type=argparse.FileType("w"), default=sys.stdout,
+        help="File to write solutions to, defaults to stdout")
+    solve.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Number of worker processes, defaults to the number of CPUs")
+    solve.add_argument(
+        "-c", "--chunksize", type=int, default=256,
+        help="Number of puzzles sent to a worker at a time")
+    solve.add_argument(
+        "-b", "--blank", default="0",
+        help="Character used to represent an empty cell in the output")
+    solve.add_argument(
+        "-e", "--engine", choices=("dlx", "techniques", "batch"), default="dlx",
+        help="Engine used to solve each puzzle")
+    solve.add_argument(
+        "--timeout", type=float, default=None,
+        help="Seconds each puzzle may take, after which an empty line is "
+             "written for it")
+    solve.add_argument(
+        "--max-nodes", type=int, default=None,
+        help="Number of guesses each puzzle may make, after which an empty "
+             "line is written for it")
+    caches = solve.add_mutually_exclusive_group()
+    caches.add_argument(
+        "--cache", default=None,
+        help="File in which to keep solutions, so that puzzles equivalent to "
+             "ones solved before are not solved again")
+    caches.add_argument(
+        "--store", default=None,
+        help="Store of solved puzzles, written by the store command, to look "
+             "puzzles up in before solving them")
+
+    store = commands.add_parser(
+        "store",
+        help="Solve puzzles given one per line and write them to a store")
+    store.add_argument(
+        "store",
+        help="File to write the store to")
+    store.add_argument(
+        "input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+        help="File to read puzzles from, defaults to stdin")
+    store.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Number of worker processes, defaults to the number of CPUs")
+
+    generate = commands.add_parser(
+        "generate",
+        help="Generate puzzles with a unique solution, one per line")
+    generate.add_argument(
+        "count", type=int,
+        help="Number of puzzles to generate")
+    generate.add_argument(
+        "-o", "--output", type=argparse.FileType("w"), default=sys.stdout,
+        help="File to write puzzles to, defaults to stdout")
+    generate.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Number of worker processes, defaults to the number of CPUs")
+    generate.add_argument(
+        "-s", "--seed", type=int, default=None,
+        help="Seed for the random number generator")
+    generate.add_argument(
+        "-d", "--difficulty", choices=DIFFICULTIES[1:], default=None,
+        help="Difficulty of the puzzles")
+    generate.add_argument(
+        "-b", "--blank", default="0",
+        help="Character used to represent an empty cell in the output")
+
+    checker = commands.add_parser(
+        "validate",
+        help="Check puzzles given one per line, printing the problems with "
+             "any which break the rules and exiting with an error if there "
+             "are any")
+    checker.add_argument(
+        "input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+        help="File to read puzzles from, defaults to stdin")
+
+    server = commands.add_parser(
+        "serve",
+        help="Run a TCP server which reads puzzles one per line and replies "
+             "with each solution on a line of its own")
+    server.add_argument(
+        "--host", default="127.0.0.1",
+        help="Address to listen on")
+    server.add_argument(
+        "-p", "--port", type=int, default=8765,
+        help="Port to listen on")
+    server.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="Number of worker processes, defaults to the number of CPUs")
+    server.add_argument(
+        "-c", "--batch-size", type=int, default=64,
+        help="Largest number of puzzles sent to a worker at a time")
+    server.add_argument(
+        "--max-pending", type=int, default=1024,
+        help="Number of puzzles which can wait to be solved before the "
+             "server stops reading more")
+    server.add_argument(
+        "-e", "--engine", choices=("dlx", "techniques"), default="dlx",
+        help="Engine used to solve each puzzle")
+    server.add_argument(
+        "--timeout", type=float, default=None,
+        help="Seconds each puzzle may take, after which an empty line is "
+             "sent for it")
+    server.add_argument(
+        "--max-nodes", type=int, default=None,
+        help="Number of guesses each puzzle may make, after which an empty "
+             "line is sent for it")
+
+    benchmark = commands.add_parser(
+        "bench",
+        help="Benchmark the solvers on the corpora shipped with pysudoku")
+    benchmark.add_argument(
+        "-c", "--corpus", action="append", choices=bench.CORPORA,
+        help="Corpus to solve, may be given more than once, defaults to all "
+             "of them")
+    benchmark.add_argument(
+        "-e", "--configuration", action="append",
+        choices=[name for name, _, _ in bench.CONFIGURATIONS],
+        help="Configuration to benchmark, may be given more than once, "
+             "defaults to all of them")
+    benchmark.add_argument(
+        "-r", "--repeat", type=int, default=1,
+        help="Number of times each corpus is solved")
+    benchmark.add_argument(
+        "--startup", action="store_true",
+        help="Also time importing pysudoku and solving a first puzzle in a "
+             "new process")
+    benchmark.add_argument(
+        "--scaling", action="store_true",
+        help="Also benchmark random puzzles on 9x9, 16x16 and 25x25 boards")
+    benchmark.add_argument(
+        "--save", default=None,
+        help="File to save the results to, for use as a baseline")
+    benchmark.add_argument(
+        "--baseline", default=None,
+        help="File of saved results to compare against, exiting with an "
+             "error if there are any regressions")
+    benchmark.add_argument(
+        "--tolerance", type=float, default=0.1,
+        help="Fraction by which a result may be worse than the baseline")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        results = bench.run(
+            args.corpus or bench.CORPORA, args.configuration, args.repeat)
+        if args.scaling:
+            results += bench.scaling(
+                configurations=args.configuration or ("techniques",),
+                repeat=args.repeat)
+
+        print(bench.format_results(results))
+
+        if args.startup:
+            imported, solved = bench.startup()
+            print(f"import {imported:.1f} ms, first solve {solved:.1f} ms")
+
+        if args.save:
+            bench.save_baseline(results, args.save)
+
+        if args.baseline:
+            regressions = bench.compare(
+                results, bench.load_baseline(args.baseline), args.tolerance)
+            for regression in regressions:
+                print(regression)
+
+            if regressions:
+                sys.exit(1)
+
+        return
+
+    if args.command == "validate":
+
+        # Puzzles are checked a chunk at a time, so that files of any size
+        # can be validated without reading them into memory
+        lines = read_lines(args.input)
+        count = invalid = 0
+        while True:
+            chunk = list(itertools.islice(lines, VALIDATE_CHUNKSIZE))
+            if not chunk:
+                break
+
+            results = validate_many([puzzle for _, puzzle in chunk])
+            count += len(chunk)
+            for (number, _), problems in zip(chunk, results):
+                invalid += bool(problems)
+                for problem in problems:
+                    print(f"Line {number}: {problem.message}")
+
+        if invalid:
+            print(f"{invalid} of {count} puzzles are invalid")
+            sys.exit(1)
+
+        return
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(
+                args.host,
+                args.port,
+                workers=args.workers,
+                batch_size=args.batch_size,
+                max_pending=args.max_pending,
+                engine=args.engine,
+                timeout=args.timeout,
+                max_nodes=args.max_nodes))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == "generate":
+        puzzles = generate_many(
+            args.count,
+            workers=args.workers,
+            seed=args.seed,
+            difficulty=args.difficulty)
+
+        write_puzzles(args.output, puzzles, blank=args.blank)
+        return
+
+    if args.command == "store":
+        write_store(
+            args.store,
+            solve_many(_storable(args.input), workers=args.workers))
+        return
+
+    # Solutions are written in the same order as the puzzles, with an empty
+    # line for any puzzle which has no solution or can't be read, so that the
+    # output stays aligned with the input
+    cache = None
+    if args.cache:
+        cache = SolutionCache(path=args.cache)
+    elif args.store:
+        cache = SolutionStore(args.store)
+
+    readable = collections.deque()
+    results = solve_many(
+        _readable(args.input, readable),
+        workers=args.workers,
+        chunksize=args.chunksize,
+        engine=args.engine,
+        cache=cache,
+        timeout=args.timeout,
+        max_nodes=args.max_nodes)
+
+    try:
+        write_puzzles(
+            args.output,
+            _aligned(results, readable),
+            blank=args.blank)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _readable(file, readable):
+    """
+    Generate the puzzles in a file which can be read, reporting those which
+    can't on stderr rather than stopping partway through. Whether each line
+    could be read is appended to readable, for _aligned.
+    """
+
+    for number, puzzle in read_lines(file):
+        try:
+            parse(puzzle)
+        except ValueError as error:
+            print(f"Line {number}: {error}, skipped", file=sys.stderr)
+            readable.append(False)
+            continue
+
+        readable.append(True)
+        yield puzzle
+
+
+def _aligned(results, readable):
+    """
+    Generate the solution for each line read by _readable, with None for each
+    line which couldn't be read
+    """
+
+    # The results are in order, so every line up to the puzzle of a result
+    # has been read by the time it arrives
+    for _, solution in results:
+        while not readable.popleft():
+            yield None
+
+        yield solution
+
+    for _ in readable:
+        yield None
+
+
+def _storable(file):
+    """
+    Generate the puzzles in a file which can be kept in a store, reporting
+    those which can't on stderr rather than stopping partway through
+    """
+
+    for number, puzzle in read_lines(file):
+        try:
+            pack(puzzle)
+        except ValueError as error:
+            print(f"Line {number}: {error}, skipped", file=sys.stderr)
+            continue
+
+        yield puzzle
+
+
+if __name__ == "__main__":
+    main()
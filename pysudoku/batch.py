@@ -0,0 +1,209 @@
+"""
+Vectorised solving of many puzzles at once.
+
+The values of N puzzles are held in an (N, 81) array, and sole and unique
+candidates are placed in all of them at once using NumPy operations over the
+geometry tables. Puzzles which are still incomplete are then searched in a
+batch as well, so only the few which need a very large search are passed one
+at a time to the backtracking search.
+
+This module requires NumPy, which is not needed by the rest of pysudoku, and
+only solves 9x9 puzzles.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("pysudoku.batch requires numpy") from None
+
+from . import geometry
+from .grid import ALL, Grid, POPCOUNT, DIGITS, to_string
+from .search import Search
+
+UNITS = np.array(geometry.UNITS, dtype=np.intp)
+UNITS_FOR = np.array(geometry.UNITS_FOR, dtype=np.intp)
+
+# Lookup tables indexed by value or candidate mask
+BITS = np.array([0] + [1 << d for d in range(geometry.SIZE)], dtype=np.uint16)
+COUNTS = np.array(POPCOUNT, dtype=np.uint8)
+SOLE = np.array(
+    [digits[0] if len(digits) == 1 else 0 for digits in DIGITS],
+    dtype=np.uint8)
+
+
+def to_array(puzzles):
+    """
+    Convert a list of 81 character puzzle strings, in which '0' or '.'
+    represent an empty cell, into an (N, 81) array of cell values
+    """
+
+    puzzles = [puzzle.strip() for puzzle in puzzles]
+    for puzzle in puzzles:
+        if len(puzzle) != geometry.CELLS:
+            raise ValueError(f"Expected {geometry.CELLS} characters, "
+                             f"got {len(puzzle)}")
+
+    text = "".join(puzzles).replace(".", "0").encode("ascii", "replace")
+    values = np.frombuffer(text, dtype=np.uint8) - ord("0")
+    if values.size and values.max() > geometry.SIZE:
+        raise ValueError("Puzzles may only contain the digits 0-9 and '.'")
+
+    return values.reshape(len(puzzles), geometry.CELLS)
+
+
+def candidates(values):
+    """
+    Return the digits placed in each unit and the candidates of each cell,
+    as (N, 27) and (N, 81) arrays of masks, for an (N, 81) array of values
+    """
+
+    seen = np.bitwise_or.reduce(BITS[values][:, UNITS], axis=2)
+    masks = ALL & ~np.bitwise_or.reduce(seen[:, UNITS_FOR], axis=2)
+    masks[values != 0] = 0
+    return seen, masks
+
+
+def propagate(values):
+    """
+    Repeatedly place sole and unique candidates in every puzzle until no
+    further progress can be made, updating the array of values in place.
+    Returns a boolean array flagging the puzzles found to be contradictory.
+
+    arguments
+    ---------
+    values : numpy.ndarray
+        An (N, 81) array of cell values, where 0 represents an empty cell
+    """
+
+    conflict = np.zeros(len(values), dtype=bool)
+    active = np.arange(len(values))
+
+    while active.size:
+        current = values[active]
+
+        # Digits placed in each unit. The bits of distinct digits never
+        # overlap, so a unit contains a repeated digit exactly when the sum
+        # of its bits differs from their union.
+        seen, masks = candidates(current)
+        bits = BITS[current][:, UNITS].sum(axis=2, dtype=np.uint32)
+        repeated = (bits != seen).any(axis=1)
+
+        # Find the digits which can go in exactly one cell of each unit
+        once = np.zeros_like(seen)
+        twice = np.zeros_like(seen)
+        for cells in UNITS.T:
+            twice |= once & masks[:, cells]
+            once |= masks[:, cells]
+
+        unique = np.bitwise_or.reduce((once & ~twice)[:, UNITS_FOR], axis=2)
+        unique &= masks
+        hidden = COUNTS[unique]
+
+        failed = (repeated
+                  | ((once | seen) != ALL).any(axis=1)
+                  | ((current == 0) & (masks == 0)).any(axis=1)
+                  | (hidden > 1).any(axis=1))
+
+        digits = np.where(hidden == 1, SOLE[unique], SOLE[masks])
+        digits[failed] = 0
+        progress = (digits != 0).any(axis=1)
+
+        values[active] = current + digits
+        conflict[active[failed]] = True
+        active = active[progress]
+
+    return conflict
+
+
+def solve(puzzles, limit=64, cache=None):
+    """
+    Solve a list of puzzle strings, returning a list containing the solution
+    to each as a string, or None if the puzzle has no solution.
+
+    Puzzles which can't be solved by propagation alone are searched
+    breadth first, also in a batch. Each step chooses the empty cell with
+    the fewest candidates in every unsolved board and replaces the board
+    with one copy per candidate, discarding contradictory boards. Any puzzle
+    whose number of boards exceeds the limit is instead solved on its own by
+    the backtracking search.
+
+    arguments
+    ---------
+    puzzles : list
+        Puzzles to solve, each an 81 character string with '0' or '.'
+        representing an empty cell
+
+    limit : int
+        Maximum number of boards searched at once for each puzzle
+
+    cache : SolutionCache
+        Cache which is checked for the solution of each puzzle before
+        solving, and which remembers the solutions found. A SolutionStore
+        can also be used as a read-only cache
+    """
+
+    if cache is not None:
+        solutions = [cache.get(puzzle) for puzzle in puzzles]
+        missing = [i for i, solution in enumerate(solutions) if not solution]
+        found = solve([puzzles[i] for i in missing], limit)
+        for i, solution in zip(missing, found):
+            cache.put(puzzles[i], solution)
+            solutions[i] = solution
+
+        return solutions
+
+    solutions = [None] * len(puzzles)
+    values = to_array(puzzles).copy()
+    origins = np.arange(len(values))
+    found = np.zeros(len(values), dtype=bool)
+    fallback = []
+
+    while len(values):
+        conflict = propagate(values)
+        complete = ~conflict & (values != 0).all(axis=1)
+
+        # Puzzles with several solutions may be completed by more than one
+        # board, keep the first and stop searching the others
+        for number, row in zip(origins[complete], values[complete]):
+            if not found[number]:
+                solutions[number] = to_string(row.tolist())
+                found[number] = True
+
+        remaining = ~conflict & ~complete & ~found[origins]
+        values, origins = values[remaining], origins[remaining]
+        if not len(values):
+            break
+
+        _, masks = candidates(values)
+        counts = np.where(values == 0, COUNTS[masks], geometry.SIZE + 1)
+        cells = counts.argmin(axis=1)
+        rows = np.arange(len(values))
+        branches = masks[rows, cells]
+
+        boards = np.bincount(
+            origins, weights=COUNTS[branches], minlength=len(found))
+        if (boards > limit).any():
+            fallback.extend(np.flatnonzero(boards > limit).tolist())
+            keep = boards[origins] <= limit
+            values, origins = values[keep], origins[keep]
+            cells, branches = cells[keep], branches[keep]
+
+        # Copy each board once per candidate of its chosen cell
+        children, child_origins = [], []
+        for digit in range(1, geometry.SIZE + 1):
+            chosen = (branches & BITS[digit]) != 0
+            child = values[chosen]
+            child[np.arange(len(child)), cells[chosen]] = digit
+            children.append(child)
+            child_origins.append(origins[chosen])
+
+        values = np.concatenate(children)
+        origins = np.concatenate(child_origins)
+
+    search = Search()
+    for number in fallback:
+        grid = Grid(to_array([puzzles[number]])[0].tolist())
+        if not grid.conflict and search.solve(grid):
+            solutions[number] = to_string(grid.values)
+
+    return solutions
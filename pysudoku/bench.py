@@ -0,0 +1,370 @@
+"""
+Benchmarks of solver throughput.
+
+Each of the corpora shipped in pysudoku/corpora is solved by each of the
+configurations below, recording the number of puzzles solved per second, the
+median and 99th percentile time to solve a puzzle, the number of guesses
+made by the backtracking search and the peak memory allocated while solving.
+Results can be saved as a baseline, and later results compared against it to
+catch performance regressions. Larger boards are benchmarked by scaling(),
+which shows how the time to solve a puzzle grows with the size of the board.
+"""
+
+import collections
+import importlib.util
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from .generator import Generator
+from .grid import parse, to_string
+from .stats import Stats
+from .stream import read_puzzles
+from .sudoku import Sudoku
+
+CORPORA_DIRECTORY = os.path.join(os.path.dirname(__file__), "corpora")
+CORPORA = ("easy", "medium", "hard", "killers")
+
+# Configurations which are benchmarked, as (name, engine, techniques). The
+# batch engine solves a whole corpus at once, so has no time per puzzle.
+CONFIGURATIONS = (
+    ("dlx", "dlx", None),
+    ("techniques", "techniques", None),
+    ("singles", "techniques", ("sole_candidate", "unique_candidate")),
+    ("batch", "batch", None),
+)
+
+# Sizes of board benchmarked by scaling()
+SIZES = (9, 16, 25)
+
+# Result of benchmarking one configuration on one corpus. Times are in
+# milliseconds and memory in kilobytes. The nodes and the times per puzzle
+# are None for the batch engine, which solves a whole corpus at once.
+Result = collections.namedtuple(
+    "Result",
+    ["corpus", "configuration", "puzzles", "rate", "p50", "p99", "nodes",
+     "memory"])
+
+
+def load_corpus(name):
+    """
+    Return the puzzles in one of the shipped corpora as a list of 81
+    character strings
+    """
+
+    if name not in CORPORA:
+        raise ValueError(f"Unknown corpus '{name}'")
+
+    with open(os.path.join(CORPORA_DIRECTORY, f"{name}.txt")) as file:
+        return list(read_puzzles(file))
+
+
+def run(corpora=CORPORA, configurations=None, repeat=1):
+    """
+    Benchmark each configuration on each corpus, returning a list of Results
+
+    arguments
+    ---------
+    corpora : list
+        Names of the corpora to solve
+
+    configurations : list
+        Names of the configurations to benchmark, from those in
+        CONFIGURATIONS, defaults to all of them. The batch configuration is
+        skipped if numpy isn't installed
+
+    repeat : int
+        Number of times each corpus is solved, the timings are taken from
+        every run
+    """
+
+    names = [name for name, _, _ in CONFIGURATIONS]
+    if configurations is None:
+        configurations = [name for name in names
+                          if name != "batch" or _has_numpy()]
+
+    for name in configurations:
+        if name not in names:
+            raise ValueError(f"Unknown configuration '{name}'")
+
+    results = []
+    for corpus in corpora:
+        puzzles = load_corpus(corpus)
+        for name, engine, techniques in CONFIGURATIONS:
+            if name in configurations:
+                results.append(_benchmark(
+                    corpus, name, engine, techniques, puzzles, repeat))
+
+    return results
+
+
+def scaling(sizes=SIZES, configurations=("techniques",), count=4,
+            givens=0.5, seed=0, repeat=1):
+    """
+    Benchmark each configuration on boards of each size, returning a list of
+    Results whose corpus is the size of the board, such as "16x16". The
+    puzzles are made by removing cells at random from random solutions, so
+    they are the same every time for the same seed, but may have more than
+    one solution.
+
+    arguments
+    ---------
+    sizes : list
+        Number of rows and columns in the boards to solve
+
+    configurations : list
+        Names of the configurations to benchmark, from those in
+        CONFIGURATIONS. The batch configuration only solves 9x9 boards, so
+        is skipped for the others
+
+    count : int
+        Number of puzzles of each size to solve
+
+    givens : float
+        Fraction of the cells in each puzzle which are given
+
+    seed : int
+        Seed used to make the puzzles
+
+    repeat : int
+        Number of times the puzzles of each size are solved
+    """
+
+    names = [name for name, _, _ in CONFIGURATIONS]
+    for name in configurations:
+        if name not in names:
+            raise ValueError(f"Unknown configuration '{name}'")
+
+    results = []
+    for size in sizes:
+        puzzles = _random_puzzles(size, count, givens, seed)
+        for name, engine, techniques in CONFIGURATIONS:
+            if name in configurations and (engine != "batch" or size == 9):
+                results.append(_benchmark(
+                    f"{size}x{size}", name, engine, techniques, puzzles,
+                    repeat))
+
+    return results
+
+
+def _random_puzzles(size, count, givens, seed):
+    """
+    Return puzzles of the given size made by removing cells at random from
+    random solutions
+    """
+
+    rng = random.Random(f"{seed}:{size}")
+    puzzles = []
+    for number in range(count):
+        values = Generator(f"{seed}:{size}:{number}", size).solution().values
+        puzzles.append(to_string(
+            value if rng.random() < givens else 0 for value in values))
+
+    return puzzles
+
+
+# Script run in a new interpreter to time importing pysudoku and solving a
+# first puzzle
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import pysudoku
+imported = time.perf_counter()
+pysudoku.boards.easy.solve()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def startup(repeat=5):
+    """
+    Return the median time in milliseconds taken by a new process to import
+    pysudoku, and then to solve its first puzzle, as a tuple
+
+    arguments
+    ---------
+    repeat : int
+        Number of processes to time
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [root, environment.get("PYTHONPATH")]))
+
+    imports, solves = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT], env=environment,
+            stdout=subprocess.PIPE, check=True, universal_newlines=True)
+        imported, solved = map(float, output.stdout.split())
+        imports.append(1000 * imported)
+        solves.append(1000 * solved)
+
+    return statistics.median(imports), statistics.median(solves)
+
+
+def _has_numpy():
+    """
+    Returns True if numpy is installed, which the batch engine requires
+    """
+
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _benchmark(corpus, name, engine, techniques, puzzles, repeat):
+    """
+    Benchmark one configuration on one corpus
+    """
+
+    times = []
+    nodes = None
+    elapsed = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if engine == "batch":
+            _solve_batch(puzzles)
+        else:
+            for puzzle in puzzles:
+                begin = time.perf_counter()
+                guesses = _solve(puzzle, engine, techniques)
+                times.append(time.perf_counter() - begin)
+                if guesses is not None:
+                    nodes = (nodes or 0) + guesses
+
+        elapsed += time.perf_counter() - start
+
+    if nodes is not None:
+        nodes //= repeat
+
+    # Measure memory separately, as tracing allocations slows solving down
+    tracemalloc.start()
+    if engine == "batch":
+        _solve_batch(puzzles)
+    else:
+        for puzzle in puzzles:
+            _solve(puzzle, engine, techniques)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = p99 = None
+    if times:
+        times.sort()
+        p50 = 1000 * times[(len(times) - 1) // 2]
+        p99 = 1000 * times[min(len(times) - 1, int(0.99 * len(times)))]
+
+    return Result(
+        corpus, name, len(puzzles), repeat * len(puzzles) / elapsed, p50,
+        p99, nodes, peak / 1024)
+
+
+def _solve(puzzle, engine, techniques):
+    """
+    Solve a single puzzle, returning the number of guesses made. The dlx
+    engine counts every row it chooses, as it doesn't tell forced placements
+    apart from guesses.
+    """
+
+    if engine == "dlx":
+        from . import dlx
+        stats = Stats()
+        dlx.solve(parse(puzzle), stats=stats)
+        return stats.nodes
+
+    grade = Sudoku.from_string(puzzle).grade(techniques=techniques)
+    return grade.counts['backtracking']
+
+
+def _solve_batch(puzzles):
+    """
+    Solve a list of puzzles using the batch engine
+    """
+
+    from . import batch
+    batch.solve(puzzles)
+
+
+def save_baseline(results, path):
+    """
+    Save a list of Results as a baseline to compare later results against
+    """
+
+    with open(path, "w") as file:
+        json.dump([result._asdict() for result in results], file, indent=2)
+
+
+def load_baseline(path):
+    """
+    Load a list of Results saved by save_baseline
+    """
+
+    with open(path) as file:
+        return [Result(**result) for result in json.load(file)]
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compare Results against a baseline, returning a list of descriptions of
+    each regression. A regression is a drop in the rate, or a rise in the
+    99th percentile time, the nodes or the memory, of more than the
+    tolerance.
+
+    arguments
+    ---------
+    results : list
+        Results to check
+
+    baseline : list
+        Results to compare against
+
+    tolerance : float
+        Fraction by which a measurement can be worse than the baseline
+        before it counts as a regression
+    """
+
+    expected = {(r.corpus, r.configuration): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = expected.get((result.corpus, result.configuration))
+        if before is None:
+            continue
+
+        label = f"{result.corpus}/{result.configuration}"
+        if result.rate < before.rate * (1 - tolerance):
+            regressions.append(
+                f"{label}: rate fell from {before.rate:.1f} "
+                f"to {result.rate:.1f} puzzles/s")
+
+        for field in ("p99", "nodes", "memory"):
+            old, new = getattr(before, field), getattr(result, field)
+            if old is not None and new is not None and new > old * (
+                    1 + tolerance):
+                regressions.append(
+                    f"{label}: {field} rose from {old:.1f} to {new:.1f}")
+
+    return regressions
+
+
+def format_results(results):
+    """
+    Return a table of Results as a string
+    """
+
+    def show(value, digits=1):
+        return "-" if value is None else f"{value:.{digits}f}"
+
+    lines = [
+        f"{'corpus':<10}{'configuration':<14}{'puzzles':>8}{'per sec':>10}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'nodes':>9}{'peak KB':>10}"]
+
+    for r in results:
+        lines.append(
+            f"{r.corpus:<10}{r.configuration:<14}{r.puzzles:>8}"
+            f"{show(r.rate):>10}{show(r.p50, 2):>9}{show(r.p99, 2):>9}"
+            f"{show(r.nodes, 0):>9}{show(r.memory):>10}")
+
+    return "\n".join(lines)
@@ -0,0 +1,166 @@
+import array
+from . import geometry
+from .grid import Grid, parse
+from .sudoku import Sudoku
+
+# Translation table from cell values to the characters of a puzzle string
+_TO_TEXT = bytes.maketrans(
+    bytes(range(len(geometry.SYMBOLS))), geometry.SYMBOLS.encode("ascii"))
+
+
+def _typecode(cells):
+    """
+    Return the array typecode used to hold the candidate masks of a board
+    with the given number of cells, which is two bytes for boards of up to
+    16x16 and four bytes for larger boards
+    """
+
+    return "H" if cells <= 256 else "I"
+
+
+class Board:
+    """
+    A compact, immutable snapshot of a Sudoku. The values are held as one
+    byte per cell and the candidates as one two byte mask per cell (four
+    bytes for 25x25 boards), so a Board is cheap to copy, hash, compare and
+    pickle, and can be used as a dictionary key or passed between processes.
+    """
+
+    __slots__ = ("values", "_masks", "_hash")
+
+    def __init__(self, values, masks=None):
+        """
+        Create a new Board object
+
+        arguments
+        ---------
+        values : bytes
+            The cell values, where 0 represents an empty cell, such as 81
+            values for a 9x9 board
+
+        masks : bytes
+            The candidate mask of each cell as native unsigned shorts, or
+            unsigned ints for 25x25 boards, see pysudoku.grid. Calculated
+            from the values if this is None
+        """
+
+        values = bytes(values)
+        geometry.for_cells(len(values))
+
+        if masks is None:
+            masks = array.array(
+                _typecode(len(values)), Grid(values).masks).tobytes()
+
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "_masks", bytes(masks))
+        object.__setattr__(self, "_hash", None)
+
+    @classmethod
+    def from_string(cls, puzzle):
+        """
+        Create a new Board object from a string, in which '0' or '.'
+        represent an empty cell, see pysudoku.grid.parse
+        """
+
+        return cls(parse(puzzle))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Create a new Board object holding the values and candidates of a Grid
+        """
+
+        masks = array.array(_typecode(len(grid.values)), grid.masks)
+        return cls(grid.values, masks.tobytes())
+
+    @classmethod
+    def from_sudoku(cls, sudoku):
+        """
+        Create a new Board object holding the values and candidates of a
+        Sudoku
+        """
+
+        return cls.from_grid(sudoku.grid)
+
+    @property
+    def masks(self):
+        """
+        Return a read-only view of the candidate mask of each cell
+        """
+
+        return memoryview(self._masks).cast(_typecode(len(self.values)))
+
+    @property
+    def solved(self):
+        """
+        Returns True if every cell has a value
+        """
+
+        return 0 not in self.values
+
+    def to_string(self):
+        """
+        Return the Board as a string, in which '0' represents an empty cell
+        """
+
+        return self.values.translate(_TO_TEXT).decode("ascii")
+
+    def to_grid(self):
+        """
+        Return a new Grid with the values and candidates of this Board
+        """
+
+        grid = Grid(self.values)
+        self._restrict(grid)
+        return grid
+
+    def to_sudoku(self):
+        """
+        Return a new Sudoku with the values and candidates of this Board
+        """
+
+        size = geometry.for_cells(len(self.values)).SIZE
+        values = self.values
+        sudoku = Sudoku([values[r * size:(r + 1) * size] for r in range(size)])
+        self._restrict(sudoku.grid)
+        return sudoku
+
+    def _restrict(self, grid):
+        """
+        Remove any candidates from a grid of the same values which have also
+        been removed from this Board
+        """
+
+        for index, mask in enumerate(self.masks):
+            if not grid.values[index]:
+                grid.restrict(index, mask)
+
+        grid.trail = []
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Board objects are immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Board):
+            return NotImplemented
+
+        return self.values == other.values and self._masks == other._masks
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(
+                self, "_hash", hash((self.values, self._masks)))
+
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Board, (self.values, self._masks)
+
+    def __repr__(self):
+        return f"pysudoku.Board('{self.to_string()}')"
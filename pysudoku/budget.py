@@ -0,0 +1,121 @@
+"""
+Limits on the work done by a solve.
+
+A Budget is passed to Sudoku.solve or to one of the search engines, which
+check it before every guess and stop once it has run out, so that a puzzle
+which would take too long, or would never finish, can't hold a process
+indefinitely.
+"""
+
+import time
+
+
+class Budget:
+    def __init__(self, timeout=None, max_nodes=None, token=None):
+        """
+        Create a new Budget object. The clock starts when the Budget is
+        created, so a Budget should be created for each solve, for example
+        when a request arrives.
+
+        arguments
+        ---------
+        timeout : float
+            Number of seconds after which solving stops, or None for no limit
+
+        max_nodes : int
+            Number of guesses after which solving stops, or None for no limit
+
+        token : threading.Event
+            Solving stops as soon as this is set, from another thread or
+            process. Anything with an is_set() method can be used, such as a
+            multiprocessing.Event
+        """
+
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.token = token
+        self.started = time.perf_counter()
+        self.deadline = None
+        if timeout is not None:
+            self.deadline = self.started + timeout
+
+        # Guesses charged to the budget so far, and why it ran out, which is
+        # one of "time", "nodes" or "cancelled", or None if it hasn't
+        self.nodes = 0
+        self.reason = None
+
+    @property
+    def elapsed(self):
+        """
+        Return the number of seconds since the Budget was created
+        """
+
+        return time.perf_counter() - self.started
+
+    def charge(self):
+        """
+        Charge a guess to the budget, returning True if the budget has run
+        out and the guess shouldn't be made
+        """
+
+        if self.exceeded():
+            return True
+
+        self.nodes += 1
+        return False
+
+    def exceeded(self):
+        """
+        Return True if the budget has run out, recording why
+        """
+
+        if self.reason is not None:
+            return True
+
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.reason = "nodes"
+        elif self.deadline is not None and time.perf_counter() > self.deadline:
+            self.reason = "time"
+        elif self.token is not None and self.token.is_set():
+            self.reason = "cancelled"
+
+        return self.reason is not None
+
+    def __repr__(self):
+        return ("pysudoku.Budget("
+                f"timeout={self.timeout}, "
+                f"max_nodes={self.max_nodes}, "
+                f"nodes={self.nodes}, "
+                f"reason={self.reason!r})")
+
+
+class BudgetExceeded:
+    def __init__(self, budget, stats=None):
+        """
+        Create a new BudgetExceeded object, which is returned by a solve that
+        ran out of budget before finishing. It is false in a boolean context,
+        like the False returned by a solve which found no solution, so
+        callers which only check for success need not tell the two apart.
+
+        arguments
+        ---------
+        budget : Budget
+            The Budget which ran out
+
+        stats : Stats
+            Stats recorded up to the point at which solving stopped
+        """
+
+        self.reason = budget.reason
+        self.nodes = budget.nodes
+        self.elapsed = budget.elapsed
+        self.stats = stats
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return ("pysudoku.BudgetExceeded("
+                f"reason={self.reason!r}, "
+                f"nodes={self.nodes}, "
+                f"elapsed={self.elapsed:.6f})")
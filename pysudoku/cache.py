@@ -0,0 +1,158 @@
+import collections
+import dbm
+from .canonical import canonicalise
+
+# Number of canonicalised puzzles remembered between a get() and a put()
+RECENT = 1024
+
+
+def cache_key(puzzle):
+    """
+    Return the key under which the solution to a puzzle is cached, which is
+    its canonical form and the Transform onto it, or (None, None) for a
+    puzzle whose givens conflict. Finding the key is the expensive part of a
+    lookup, so it can be found in another process and passed to get() and
+    put().
+    """
+
+    try:
+        return canonicalise(puzzle)
+    except ValueError:
+        return None, None
+
+
+class SolutionCache:
+    def __init__(self, maxsize=4096, path=None):
+        """
+        Create a new SolutionCache object, which remembers the solutions of
+        puzzles by their canonical form, so that a puzzle which is equivalent
+        to one solved before is answered without being solved again. The
+        most recently used solutions are kept in memory, and every solution
+        can also be kept on disk.
+
+        arguments
+        ---------
+        maxsize : int
+            Number of solutions kept in memory, the least recently used
+            solution is discarded once there are more than this
+
+        path : str
+            File in which to keep every solution, so that they are available
+            to later runs. Solutions are only kept in memory if this is None
+        """
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._solutions = collections.OrderedDict()
+        self._database = dbm.open(path, "c") if path is not None else None
+
+        # The most recently canonicalised puzzles, so that a get() which
+        # misses followed by a put() of the same puzzle only canonicalises
+        # it once
+        self._recent = collections.OrderedDict()
+
+    def get(self, puzzle, key=None):
+        """
+        Return the solution to an 81 character puzzle string as a string, or
+        None if no equivalent puzzle has been solved
+
+        arguments
+        ---------
+        puzzle : str
+            The puzzle to look up
+
+        key : tuple
+            The key of the puzzle, as returned by cache_key, which is found
+            from the puzzle if this is None
+        """
+
+        canonical, transform = key or self._canonicalise(puzzle)
+        if canonical is None:
+            return None
+
+        solution = self._solutions.get(canonical)
+        if solution is not None:
+            self._solutions.move_to_end(canonical)
+
+        elif self._database is not None and canonical in self._database:
+            solution = self._database[canonical].decode("ascii")
+            self._remember(canonical, solution)
+
+        if solution is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return transform.revert(solution)
+
+    def put(self, puzzle, solution, key=None):
+        """
+        Remember the solution to an 81 character puzzle string
+
+        arguments
+        ---------
+        puzzle : str
+            The puzzle which was solved
+
+        solution : str
+            Its solution, nothing is remembered if this is None
+
+        key : tuple
+            The key of the puzzle, see get
+        """
+
+        canonical, transform = key or self._canonicalise(puzzle)
+        if canonical is None or solution is None:
+            return
+
+        solution = transform.apply(solution)
+        self._remember(canonical, solution)
+        if self._database is not None:
+            self._database[canonical] = solution
+
+    def close(self):
+        """
+        Close the file in which solutions are kept, if any
+        """
+
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def _canonicalise(self, puzzle):
+        """
+        Return the canonical form of a puzzle and the Transform onto it, or
+        (None, None) for a puzzle whose givens conflict
+        """
+
+        recent = self._recent
+        if puzzle in recent:
+            return recent.pop(puzzle)
+
+        result = cache_key(puzzle)
+        recent[puzzle] = result
+        if len(recent) > RECENT:
+            recent.popitem(last=False)
+
+        return result
+
+    def _remember(self, canonical, solution):
+        """
+        Keep a solution in memory, discarding the least recently used if
+        there are too many
+        """
+
+        self._solutions[canonical] = solution
+        self._solutions.move_to_end(canonical)
+        while len(self._solutions) > self.maxsize:
+            self._solutions.popitem(last=False)
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
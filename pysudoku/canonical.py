@@ -0,0 +1,253 @@
+"""
+Canonical forms of puzzles.
+
+Two puzzles are equivalent if one can be turned into the other by relabelling
+the digits, permuting the rows within a band or the columns within a stack,
+permuting the bands or the stacks, and transposing the board. The canonical
+form of a puzzle is the lexicographically smallest 81 character string of all
+the puzzles equivalent to it, so equivalent puzzles share a canonical form.
+
+Rather than trying each of the 3,359,232 arrangements, the canonical form is
+built a row at a time. Columns which are still interchangeable are kept
+together in groups, and only arrangements which give the smallest rows so far
+are carried forward, so the search only branches where the puzzle itself is
+symmetrical.
+"""
+
+import itertools
+from . import geometry
+from .grid import Grid, parse, to_string
+
+SIZE = geometry.SIZE
+BOX = geometry.BOX
+
+
+class Transform:
+    def __init__(self, transposed, rows, columns, labels):
+        """
+        Create a new Transform object, which maps a puzzle onto its canonical
+        form and back again
+
+        arguments
+        ---------
+        transposed : boolean
+            Whether the board is transposed before the rows and columns are
+            rearranged
+
+        rows : tuple
+            The row of the (transposed) board which is placed in each row
+
+        columns : tuple
+            The column of the (transposed) board which is placed in each
+            column
+
+        labels : tuple
+            The new label of each digit, indexed by digit, with labels[0] == 0
+        """
+
+        self.transposed = transposed
+        self.rows = rows
+        self.columns = columns
+        self.labels = labels
+
+    def _positions(self):
+        """
+        Return the index in the original board of each index in the
+        transformed board
+        """
+
+        if self.transposed:
+            return [SIZE * c + r for r in self.rows for c in self.columns]
+
+        return [SIZE * r + c for r in self.rows for c in self.columns]
+
+    def apply(self, puzzle):
+        """
+        Transform an 81 character puzzle or solution string in the same way
+        as the puzzle this Transform was created from
+        """
+
+        values = parse(puzzle)
+        labels = self.labels
+        return to_string(labels[values[i]] for i in self._positions())
+
+    def revert(self, puzzle):
+        """
+        Undo the transformation of an 81 character puzzle or solution string
+        """
+
+        inverse = [0] * len(self.labels)
+        for digit, label in enumerate(self.labels):
+            inverse[label] = digit
+
+        values = parse(puzzle)
+        original = [0] * geometry.CELLS
+        for value, index in zip(values, self._positions()):
+            original[index] = inverse[value]
+
+        return to_string(original)
+
+    def __repr__(self):
+        return (f"pysudoku.canonical.Transform("
+                f"transposed={self.transposed}, "
+                f"rows={self.rows}, "
+                f"columns={self.columns}, "
+                f"labels={self.labels})")
+
+
+def canonical_form(puzzle):
+    """
+    Return the canonical form of an 81 character puzzle string
+    """
+
+    return canonicalise(puzzle)[0]
+
+
+def canonicalise(puzzle):
+    """
+    Return the canonical form of an 81 character puzzle string, along with the
+    Transform which maps the puzzle onto it. Raises a ValueError if the
+    puzzle's givens conflict with each other.
+    """
+
+    values = parse(puzzle)
+    if len(values) != geometry.CELLS:
+        raise ValueError("Canonical forms are only defined for 9x9 puzzles")
+
+    if Grid(values).conflict:
+        raise ValueError("Puzzle contains conflicting givens")
+
+    lines = (
+        [values[SIZE * r:SIZE * (r + 1)] for r in range(SIZE)],
+        [values[c::SIZE] for c in range(SIZE)])
+
+    # Each state is an arrangement which gives the smallest rows so far, as
+    # (transposed, column groups, rows, labels, next label). The columns are
+    # held as a sequence of groups of columns which have matched in every
+    # row so far, and so can still be placed in any order.
+    states = []
+    for transposed in (False, True):
+        for stacks in itertools.permutations(range(SIZE // BOX)):
+            groups = tuple(
+                tuple(range(BOX * s, BOX * (s + 1))) for s in stacks)
+            states.append((transposed, groups, (), (0,) * (SIZE + 1), 1))
+
+    rows = []
+    for _ in range(SIZE):
+        best = None
+        winners = []
+        for state in states:
+            for row in _next_rows(state):
+                line = _relabel(lines[state[0]][row], state)
+                if best is None or line < best:
+                    best, winners = line, [(state, row)]
+                elif line == best:
+                    winners.append((state, row))
+
+        rows.append(best)
+        states = _extend(lines, winners)
+
+    transposed, groups, order, labels, following = states[0]
+    labels = list(labels)
+    for digit in range(1, SIZE + 1):
+        if not labels[digit]:
+            labels[digit] = following
+            following += 1
+
+    columns = tuple(column for group in groups for column in group)
+    transform = Transform(transposed, order, columns, tuple(labels))
+    return "".join(to_string(line) for line in rows), transform
+
+
+def _next_rows(state):
+    """
+    Return the rows which may be placed next, keeping the rows of each band
+    together
+    """
+
+    order = state[2]
+    if len(order) % BOX:
+        band = order[-1] // BOX
+        return [row for row in range(BOX * band, BOX * (band + 1))
+                if row not in order]
+
+    bands = {row // BOX for row in order}
+    return [row for row in range(SIZE) if row // BOX not in bands]
+
+
+def _relabel(line, state):
+    """
+    Return the smallest row which can be made from a line of the board,
+    given the column groups and labels of a state. Within each group empty
+    cells come first, then digits which already have a label in order of
+    their label, then new digits which take the next unused labels.
+    """
+
+    _, groups, _, labels, following = state
+    result = []
+    for group in groups:
+        known = []
+        empty = new = 0
+        for column in group:
+            value = line[column]
+            if not value:
+                empty += 1
+            elif labels[value]:
+                known.append(labels[value])
+            else:
+                new += 1
+
+        result += [0] * empty
+        result += sorted(known)
+        result += range(following, following + new)
+        following += new
+
+    return tuple(result)
+
+
+def _extend(lines, winners):
+    """
+    Return the states which follow from placing each winning row, splitting
+    the column groups so that the row is placed in its smallest form. New
+    digits in a group can be given their labels in any order, so each order
+    is tried.
+    """
+
+    states = {}
+    for (transposed, groups, order, labels, following), row in winners:
+        line = lines[transposed][row]
+
+        # For each group, the ways in which it can be split
+        splits = []
+        for group in groups:
+            empty = tuple(c for c in group if not line[c])
+            known = sorted(
+                (c for c in group if line[c] and labels[line[c]]),
+                key=lambda c: labels[line[c]])
+            new = [c for c in group if line[c] and not labels[line[c]]]
+
+            head = ((empty,) if empty else ()) + tuple((c,) for c in known)
+            splits.append([
+                (head + tuple((c,) for c in arrangement), arrangement)
+                for arrangement in itertools.permutations(new)])
+
+        for choice in itertools.product(*splits):
+            new_labels = list(labels)
+            label = following
+            new_groups = ()
+            for split, arrangement in choice:
+                new_groups += split
+                for column in arrangement:
+                    new_labels[line[column]] = label
+                    label += 1
+
+            state = (transposed, new_groups, order + (row,),
+                     tuple(new_labels), label)
+
+            # Arrangements which have placed the same rows in a different
+            # order are interchangeable from here on
+            key = (transposed, new_groups, frozenset(state[2]), row // BOX,
+                   state[3])
+            states.setdefault(key, state)
+
+    return list(states.values())
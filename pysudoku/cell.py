@@ -1,8 +1,8 @@
 from contextlib import contextmanager
-from termcolor import colored
+from . import geometry
 
 class Cell:
-    def __init__(self, row, column, value, cells):
+    def __init__(self, row, column, grid, cells):
         """
         Create a new Cell object
 
@@ -14,8 +14,8 @@ class Cell:
         column : int
             Column to which this cell belongs
 
-        value : int
-            The inital value of the cell
+        grid : Grid
+            The board core which holds the value and candidates of this cell
 
         cells : list
             Other cells that belong to the Sudoku board
@@ -24,16 +24,41 @@ class Cell:
         # Default cell values
         self._row = row
         self._column = column
+        self.index = (grid.geometry.SIZE * row) + column
         self._highlighted = False
-        self.value = value
+        self._grid = grid
 
-        # Store information about other cells on the Sudoku board
+        # Store information about other cells on the Sudoku board, the
+        # neighbour lookups are resolved on first use
         self._other_cells = cells
+        self._related_cells = None
+        self._related_cells_as_dict = None
+        self._row_cells = None
+        self._column_cells = None
+        self._square_cells = None
 
         # Store information about the status of this Cell
-        self.solved = False if value == 0 else True
         self.changed = False
-        self._candidates = []
+
+    @property
+    def value(self):
+        """
+        Return the value of this Cell, or 0 if it is empty
+        """
+
+        return self._grid.values[self.index]
+
+    @value.setter
+    def value(self, value):
+        self._grid.values[self.index] = value
+
+    @property
+    def solved(self):
+        """
+        Return True if this Cell has a value
+        """
+
+        return self._grid.values[self.index] != 0
 
     @property
     def candidates(self):
@@ -41,31 +66,27 @@ class Cell:
         Return a list of possible candidates for this Cell
         """
 
-        if not self._candidates and not self.solved:
-            for value in range(1, 10):
-                values = [c.value for c in self.related_cells if c.solved]
-                if value not in values and value not in self._candidates:
-                    self._candidates.append(value)
-
-        return self._candidates
+        return list(self._grid.geometry.DIGITS[self._grid.masks[self.index]])
 
     def update_value(self, value, solved=False):
         """
+        Update the value of this Cell. If the Cell is being solved then the
+        value is also recorded against the Cell's row, column and square.
         """
 
         self.changed = True
         if solved:
-            self.solved = True
-            self._candidates = []
-
-        self.value = value
+            self._grid.assign(self.index, value)
+        else:
+            self.value = value
 
     def remove_candidate(self, value):
         """
+        Remove a value from the candidates of this Cell, returning True if it
+        was present
         """
 
-        if value in self.candidates:
-            self._candidates.remove(value)
+        return self._grid.eliminate(self.index, value)
 
     @property
     def related_cells(self):
@@ -73,12 +94,10 @@ class Cell:
         Get all the related cells in the same row, column, and square as this
         Cell object
         """
-        cells = set()
-        for list_of_cells in self.related_cells_as_dict.values():
-            for cell in list_of_cells:
-                cells.add(cell)
+        if self._related_cells is None:
+            self._related_cells = self._lookup(self._grid.geometry.PEERS)
 
-        return cells
+        return self._related_cells
 
     @property
     def related_cells_as_dict(self):
@@ -86,11 +105,13 @@ class Cell:
         Get all the related cells in the same row, column, and square as this
         Cell object and return them as a dictionary
         """
-        return {
-            'row': self.other_cells_in_row,
-            'column': self.other_cells_in_column,
-            'square': self.other_cells_in_square}
+        if self._related_cells_as_dict is None:
+            self._related_cells_as_dict = {
+                'row': self.other_cells_in_row,
+                'column': self.other_cells_in_column,
+                'square': self.other_cells_in_square}
 
+        return self._related_cells_as_dict
 
     @property
     def other_cells_in_row(self):
@@ -98,15 +119,10 @@ class Cell:
         Get all the related cells in the same row as this Cell object
         """
 
-        cells = []
-        start, end = 9 * self._row, (9 * self._row) + 9
-        for current_cell in self._other_cells[start:end]:
-            if current_cell == self:
-                continue
-
-            cells.append(current_cell)
+        if self._row_cells is None:
+            self._row_cells = self._lookup(self._grid.geometry.ROW_PEERS)
 
-        return cells
+        return self._row_cells
 
     @property
     def other_cells_in_column(self):
@@ -114,15 +130,11 @@ class Cell:
         Get all the related cells in the same column as this Cell object
         """
 
-        cells = []
-        indexes = [self._column + (9 * row) for row in range(9)]
-        for index in indexes:
-            if self._other_cells[index] == self:
-                continue
+        if self._column_cells is None:
+            self._column_cells = self._lookup(
+                self._grid.geometry.COLUMN_PEERS)
 
-            cells.append(self._other_cells[index])
-
-        return cells
+        return self._column_cells
 
     @property
     def other_cells_in_square(self):
@@ -130,19 +142,20 @@ class Cell:
         Get all the related cells in the same square as this Cell object
         """
 
-        cells = []
-        for r in range(3):
-            for c in range(3):
-                row_index = self._row - (self._row % 3)
-                col_index = self._column - (self._column % 3)
+        if self._square_cells is None:
+            self._square_cells = self._lookup(
+                self._grid.geometry.SQUARE_PEERS)
 
-                index = (9 * row_index) + col_index + (r * 9) + c
-                if self._other_cells[index] == self:
-                    continue
+        return self._square_cells
 
-                cells.append(self._other_cells[index])
+    def _lookup(self, table):
+        """
+        Resolve this Cell's entry in one of the precomputed geometry tables
+        into a tuple of Cell objects. The board is fully populated before any
+        neighbours are requested, so the result can be cached on the Cell.
+        """
 
-        return cells
+        return tuple(self._other_cells[i] for i in table[self.index])
 
     @contextmanager
     def highlighted(self):
@@ -169,8 +182,12 @@ class Cell:
         """
         """
 
+        # termcolor is only needed for display, so isn't imported until a
+        # cell is printed
+        from termcolor import colored
+
         # Set the cell value
-        cell_value = str(self.value)
+        cell_value = geometry.SYMBOLS[self.value]
         if self.value == 0:
             cell_value = "-"
 
@@ -0,0 +1,218 @@
+"""
+Exact cover solver using Knuth's Algorithm X with dancing links.
+
+A 9x9 Sudoku is an exact cover problem with 324 constraints (each cell holds
+one digit, and each row, column and square holds each digit once) and 729
+candidate placements, each of which satisfies exactly four constraints. The
+linked structure for the full cover matrix is built once for each size of
+board, stored in flat lists, and copied for every puzzle.
+"""
+
+import functools
+from . import geometry
+
+
+@functools.lru_cache(maxsize=None)
+def _build(shape):
+    """
+    Build the dancing links structure for the empty board of the given
+    Geometry. Node 0 is the root, nodes 1 to 4 * CELLS are the column headers
+    and the remaining nodes are the four entries of each of the SIZE * CELLS
+    placements, which are laid out consecutively so that placement p starts
+    at node first[p].
+    """
+
+    cells = shape.CELLS
+    digits = shape.SIZE
+    columns = 4 * cells
+
+    left = [(i - 1) % (columns + 1) for i in range(columns + 1)]
+    right = [(i + 1) % (columns + 1) for i in range(columns + 1)]
+    up = list(range(columns + 1))
+    down = list(range(columns + 1))
+    column = list(range(columns + 1))
+    placement = [-1] * (columns + 1)
+    size = [0] * (columns + 1)
+    first = []
+
+    for index in range(cells):
+        row, col = divmod(index, digits)
+        square = shape.UNITS_FOR[index][2] - 2 * digits
+        for digit in range(digits):
+            start = len(left)
+            first.append(start)
+            headers = (
+                1 + index,
+                1 + cells + digits * row + digit,
+                1 + 2 * cells + digits * col + digit,
+                1 + 3 * cells + digits * square + digit)
+
+            for offset, header in enumerate(headers):
+                node = start + offset
+                left.append(start + (offset - 1) % 4)
+                right.append(start + (offset + 1) % 4)
+                up.append(up[header])
+                down.append(header)
+                down[up[header]] = node
+                up[header] = node
+                column.append(header)
+                placement.append(digits * index + digit)
+                size[header] += 1
+
+    return left, right, up, down, column, placement, size, first
+
+
+def solutions(values, budget=None, stats=None):
+    """
+    Generate every solution to the puzzle, each as a flat list of values
+
+    arguments
+    ---------
+    values : list
+        A flat list of cell values, where 0 represents an empty cell. The
+        size of the board is given by the number of values
+
+    budget : Budget
+        Budget charged for every row chosen, no more solutions are generated
+        once it runs out
+
+    stats : Stats
+        Stats which count every row chosen, along with the deepest the
+        search goes
+    """
+
+    shape = geometry.for_cells(len(values))
+    size = shape.SIZE
+    left, right, up, down, C, placements, sizes, first = _build(shape)
+    L, R, U, D = left[:], right[:], up[:], down[:]
+    S = sizes[:]
+
+    def cover(c):
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(c):
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    # Remove the constraints satisfied by the givens from the matrix. If two
+    # givens satisfy the same constraint there can't be any solutions.
+    covered = [False] * len(sizes)
+    for index, value in enumerate(values):
+        if not value:
+            continue
+
+        start = first[size * index + value - 1]
+        for node in range(start, start + 4):
+            if covered[C[node]]:
+                return
+
+            covered[C[node]] = True
+            cover(C[node])
+
+    solution = list(values)
+
+    # Each entry is a constraint which has been covered and the row chosen
+    # to satisfy it, which is the constraint's header until a row has been
+    # chosen. Keeping these on a stack rather than recursing lets the search
+    # go as deep as the board requires.
+    stack = []
+    descend = True
+    while True:
+        if descend:
+            c = R[0]
+            if c == 0:
+                yield list(solution)
+            else:
+
+                # Choose the constraint which can be satisfied in the fewest
+                # ways
+                best = S[c]
+                j = R[c]
+                while j != 0 and best > 1:
+                    if S[j] < best:
+                        c, best = j, S[j]
+                    j = R[j]
+
+                if best:
+                    cover(c)
+                    stack.append([c, c])
+
+        if not stack:
+            return
+
+        # Undo the row chosen for the constraint on top of the stack, then
+        # move on to its next row, or back to the constraint below if there
+        # are none left
+        entry = stack[-1]
+        c, r = entry
+        if r != c:
+            j = L[r]
+            while j != r:
+                uncover(C[j])
+                j = L[j]
+
+        r = D[r]
+        if r == c:
+            uncover(c)
+            stack.pop()
+            descend = False
+            continue
+
+        if budget is not None and budget.charge():
+            return
+
+        if stats is not None:
+            stats.nodes += 1
+            if len(stack) > stats.depth:
+                stats.depth = len(stack)
+
+        entry[1] = r
+        index, digit = divmod(placements[r], size)
+        solution[index] = digit + 1
+
+        j = R[r]
+        while j != r:
+            cover(C[j])
+            j = R[j]
+
+        descend = True
+
+
+def solve(values, budget=None, stats=None):
+    """
+    Return the first solution to the puzzle as a flat list of values, or
+    None if there is no solution
+
+    arguments
+    ---------
+    values : list
+        A flat list of cell values, where 0 represents an empty cell
+
+    budget : Budget
+        Budget charged for every row chosen, None is returned once it runs
+        out
+
+    stats : Stats
+        Stats which count the rows chosen, see solutions
+    """
+
+    return next(solutions(values, budget, stats), None)
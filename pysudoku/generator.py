@@ -0,0 +1,171 @@
+import random
+from . import geometry
+from .grid import Grid, to_string
+from .parallel import map_chunks
+from .search import Search
+
+DIFFICULTIES = (None, "easy", "hard")
+
+
+class RandomSearch(Search):
+    def __init__(self, rng):
+        """
+        Create a new RandomSearch object, which tries the candidates of each
+        cell in a random order
+
+        arguments
+        ---------
+        rng : random.Random
+            Source of randomness
+        """
+
+        super().__init__()
+        self.rng = rng
+
+    def order(self, grid, index):
+        """
+        Return the candidates of the specified cell in a random order
+        """
+
+        digits = list(super().order(grid, index))
+        self.rng.shuffle(digits)
+        return digits
+
+
+class Generator:
+    def __init__(self, seed=None, size=9):
+        """
+        Create a new Generator object
+
+        arguments
+        ---------
+        seed : int
+            Seed for the random number generator, generating from the same
+            seed always produces the same puzzles
+
+        size : int
+            Number of rows and columns in the puzzles generated, such as 9,
+            16 or 25
+        """
+
+        self.geometry = geometry.for_cells(size * size)
+        self.rng = random.Random(seed)
+        self._search = Search()
+        self._random_search = RandomSearch(self.rng)
+
+    def solution(self):
+        """
+        Return a Grid containing a random, completely solved board
+        """
+
+        grid = Grid([0] * self.geometry.CELLS)
+        self._random_search.solve(grid)
+        grid.trail = []
+        return grid
+
+    def generate(self, difficulty=None, attempts=100):
+        """
+        Generate a puzzle with a unique solution, returning it as a string.
+        Starting from a random solution, givens are removed in a random
+        order for as long as the puzzle keeps a unique solution and does not
+        exceed the requested difficulty.
+
+        arguments
+        ---------
+        difficulty : str
+            None for any puzzle, "easy" for a puzzle which can be solved
+            using only sole and unique candidates, or "hard" for one which
+            can't
+
+        attempts : int
+            Number of solutions to start from before giving up on generating
+            a puzzle of the requested difficulty
+        """
+
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+
+        for _ in range(attempts):
+            grid = self.solution()
+            self._remove_givens(grid, easy=difficulty == "easy")
+
+            if difficulty != "hard" or not self._is_easy(grid):
+                return to_string(grid.values)
+
+        raise RuntimeError(f"Failed to generate a '{difficulty}' puzzle "
+                           f"in {attempts} attempts")
+
+    def _remove_givens(self, grid, easy=False):
+        """
+        Remove as many givens as possible from a solved grid, in place
+        """
+
+        indexes = list(range(self.geometry.CELLS))
+        self.rng.shuffle(indexes)
+
+        for index in indexes:
+            digit = grid.values[index]
+            grid.clear(index)
+
+            if (easy and not self._is_easy(grid)
+                    or self._search.count(grid, limit=2) != 1):
+                grid.place(index, digit)
+
+            grid.trail = []
+
+    def _is_easy(self, grid):
+        """
+        Returns True if the grid can be solved using only sole and unique
+        candidates, leaving the grid unchanged
+        """
+
+        marker = grid.mark()
+        solved = grid.propagate() and 0 not in grid.values
+        grid.undo(marker)
+        return solved
+
+
+def generate_many(count, workers=None, seed=None, difficulty=None,
+                  chunksize=64):
+    """
+    Generate puzzles with a unique solution using a pool of worker processes,
+    each as an 81 character string. Every puzzle is generated from its own
+    seed, so the same arguments always produce the same puzzles in the same
+    order, regardless of the number of workers.
+
+    arguments
+    ---------
+    count : int
+        Number of puzzles to generate
+
+    workers : int
+        Number of worker processes, defaults to the number of CPUs
+
+    seed : int
+        Seed for the random number generator, a random seed is used if this
+        is None
+
+    difficulty : str
+        Difficulty of the puzzles, see Generator.generate
+
+    chunksize : int
+        Number of puzzles generated by a worker at a time
+    """
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    seeds = (f"{seed}:{i}" for i in range(count))
+    results = map_chunks(
+        _generate_chunk, seeds, workers, chunksize, True, difficulty)
+
+    for _, puzzle in results:
+        yield puzzle
+
+
+def _generate_chunk(seeds, difficulty):
+    """
+    Generate a puzzle for each of a list of seeds
+    """
+
+    return [Generator(seed).generate(difficulty) for seed in seeds]
@@ -0,0 +1,216 @@
+"""
+Precomputed geometry of a Sudoku board.
+
+A board is made up of SIZE x SIZE cells, where SIZE = BOX * BOX, and the cells
+are addressed by their index in a flattened board, so that the cell at row r
+and column c lives at index (SIZE * r) + c. The tables for each size are
+built the first time that size is asked for and shared by every Sudoku of
+that size. The module level tables are those of the standard 9x9 board.
+"""
+
+import functools
+import itertools
+
+# Characters used to write the values of a cell in a puzzle string, so that
+# boards of up to 25x25 can be written with one character per cell
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOP"
+
+# Supported values of BOX, and the number of cells in a board of each
+BOXES = range(2, 6)
+LENGTHS = tuple(box ** 4 for box in BOXES)
+
+
+class _Table(dict):
+    """
+    Lookup table indexed by candidate mask, in which each entry is calculated
+    the first time it is used. This is used in place of a tuple for boards
+    with too many digits to tabulate every mask up front.
+    """
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, mask):
+        value = self[mask] = self.function(mask)
+        return value
+
+
+class Geometry:
+    def __init__(self, box):
+        """
+        Create a new Geometry object, holding the tables for a board made up
+        of box x box squares. Use get() rather than creating these directly,
+        so that the tables for each size are only built once.
+
+        arguments
+        ---------
+        box : int
+            Number of rows and columns in each square
+        """
+
+        size = box * box
+        cells = size * size
+
+        self.BOX = box
+        self.SIZE = size
+        self.CELLS = cells
+
+        # The 3 * SIZE units of the board, each a tuple of cell indexes
+        self.ROWS = tuple(
+            tuple(size * r + c for c in range(size)) for r in range(size))
+
+        self.COLUMNS = tuple(
+            tuple(size * r + c for r in range(size)) for c in range(size))
+
+        self.SQUARES = tuple(
+            tuple(size * (box * (s // box) + r) + box * (s % box) + c
+                  for r in range(box) for c in range(box))
+            for s in range(size))
+
+        self.UNITS = units = self.ROWS + self.COLUMNS + self.SQUARES
+
+        # For each cell, the indexes into UNITS of its row, column and square
+        self.UNITS_FOR = units_for = tuple(
+            (index // size, size + index % size,
+             2 * size + box * (index // size // box) + index % size // box)
+            for index in range(cells))
+
+        # For each cell, the other cells in its row, column and square
+        self.ROW_PEERS, self.COLUMN_PEERS, self.SQUARE_PEERS = (
+            tuple(
+                tuple(i for i in units[units_for[index][kind]] if i != index)
+                for index in range(cells))
+            for kind in range(3))
+
+        # For each cell, the other cells in each of its units, in the same
+        # order as UNITS_FOR
+        self.UNIT_PEERS = tuple(zip(
+            self.ROW_PEERS, self.COLUMN_PEERS, self.SQUARE_PEERS))
+
+        # For each cell, the distinct cells which share a unit with it
+        self.PEERS = tuple(
+            tuple(sorted(set(self.ROW_PEERS[i] + self.COLUMN_PEERS[i]
+                             + self.SQUARE_PEERS[i])))
+            for i in range(cells))
+
+        # For each cell, the cell itself followed by its peers
+        self.NEIGHBOURHOODS = tuple(
+            (i,) + self.PEERS[i] for i in range(cells))
+
+        # For each unit, the units of a different kind which it overlaps
+        self.INTERSECTIONS = tuple(
+            self._intersections(unit) for unit in range(len(units)))
+
+        # Candidate masks have one bit for each digit. Every mask is
+        # tabulated up front for the smaller boards, and tabulated as it is
+        # used for the larger ones.
+        self.ALL = (1 << size) - 1
+
+        def digits(mask):
+            return tuple(
+                d for d in range(1, size + 1) if mask & (1 << (d - 1)))
+
+        def members(mask):
+            return tuple(p for p in range(size) if mask & (1 << p))
+
+        def popcount(mask):
+            return bin(mask).count("1")
+
+        if size <= 9:
+            masks = range(self.ALL + 1)
+            self.POPCOUNT = tuple(popcount(mask) for mask in masks)
+            self.DIGITS = tuple(digits(mask) for mask in masks)
+            self.MEMBERS = tuple(members(mask) for mask in masks)
+        else:
+            self.POPCOUNT = _Table(popcount)
+            self.DIGITS = _Table(digits)
+            self.MEMBERS = _Table(members)
+
+    def _intersections(self, unit):
+        """
+        Return the ways in which a unit overlaps a unit of a different kind
+        (a row or column with a square, or a square with a row or column), as
+        a tuple of (cells in both units, rest of this unit, rest of the other
+        unit)
+        """
+
+        cells = set(self.UNITS[unit])
+        intersections = []
+        for other, other_cells in enumerate(self.UNITS):
+            segment = cells.intersection(other_cells)
+            if other == unit or len(segment) != self.BOX:
+                continue
+
+            intersections.append((
+                tuple(sorted(segment)),
+                tuple(i for i in self.UNITS[unit] if i not in segment),
+                tuple(i for i in other_cells if i not in segment)))
+
+        return tuple(intersections)
+
+    @functools.lru_cache(maxsize=8192)
+    def subsets(self, mask, size):
+        """
+        Return every subset of the specified mask which has the given number
+        of bits set. The result is cached, so each table is only built once.
+        """
+
+        bits = [1 << p for p in self.MEMBERS[mask]]
+        return tuple(map(sum, itertools.combinations(bits, size)))
+
+    def __repr__(self):
+        return f"pysudoku.geometry.Geometry(box={self.BOX})"
+
+
+@functools.lru_cache(maxsize=None)
+def get(box=3):
+    """
+    Return the Geometry of a board made up of box x box squares
+    """
+
+    if box not in BOXES:
+        raise ValueError(
+            f"Expected a box size of {_choices(BOXES)}, got {box}")
+
+    return Geometry(box)
+
+
+def for_cells(cells):
+    """
+    Return the Geometry of a board with the given number of cells
+    """
+
+    if cells not in LENGTHS:
+        raise ValueError(f"Expected {_choices(LENGTHS)} cells, got {cells}")
+
+    return get(BOXES[LENGTHS.index(cells)])
+
+
+def _choices(values):
+    """
+    Return a list of values as a string, such as "1, 2 or 3"
+    """
+
+    values = [str(value) for value in values]
+    return ", ".join(values[:-1]) + " or " + values[-1]
+
+
+STANDARD = get(3)
+
+SIZE = STANDARD.SIZE
+BOX = STANDARD.BOX
+CELLS = STANDARD.CELLS
+
+ROWS = STANDARD.ROWS
+COLUMNS = STANDARD.COLUMNS
+SQUARES = STANDARD.SQUARES
+UNITS = STANDARD.UNITS
+UNITS_FOR = STANDARD.UNITS_FOR
+ROW_PEERS = STANDARD.ROW_PEERS
+COLUMN_PEERS = STANDARD.COLUMN_PEERS
+SQUARE_PEERS = STANDARD.SQUARE_PEERS
+UNIT_PEERS = STANDARD.UNIT_PEERS
+PEERS = STANDARD.PEERS
+NEIGHBOURHOODS = STANDARD.NEIGHBOURHOODS
+INTERSECTIONS = STANDARD.INTERSECTIONS
@@ -0,0 +1,66 @@
+# Weight of each technique, from the easiest to the hardest. Backtracking is
+# weighted per guess made during the search.
+WEIGHTS = {
+    'sole_candidate': 1,
+    'unique_candidate': 2,
+    'naked_subsets': 10,
+    'hidden_subsets': 15,
+    'pointing_candidates': 20,
+    'box_line_reduction': 25,
+    'x_wing': 30,
+    'swordfish': 40,
+    'backtracking': 50,
+}
+
+
+class Grade:
+    def __init__(self):
+        """
+        Create a new Grade object, which counts the number of times each
+        solving technique made progress while solving a Sudoku
+        """
+
+        self.counts = dict.fromkeys(WEIGHTS, 0)
+
+    def record(self, technique, count=1):
+        """
+        Record that a technique has made progress
+        """
+
+        self.counts[technique] += count
+
+    @property
+    def hardest(self):
+        """
+        Return the hardest technique which was required, or None if no
+        techniques were required
+        """
+
+        required = [t for t, count in self.counts.items() if count]
+        return max(required, key=WEIGHTS.get, default=None)
+
+    @property
+    def backtracking(self):
+        """
+        Returns True if backtracking was required
+        """
+
+        return self.counts['backtracking'] > 0
+
+    @property
+    def score(self):
+        """
+        Return the difficulty score, which is the weighted total of the
+        techniques that were applied
+        """
+
+        return sum(WEIGHTS[t] * count for t, count in self.counts.items())
+
+    def __repr__(self):
+        """
+        """
+
+        return ("pysudoku.Grade("
+                f"score={self.score}, "
+                f"hardest={self.hardest}, "
+                f"counts={self.counts})")
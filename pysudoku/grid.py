@@ -0,0 +1,313 @@
+"""
+Bitmask based board core.
+
+The candidates of each cell are stored as an integer with one bit for each
+digit, where bit (d - 1) is set if the digit d can still be placed in that
+cell. Each unit also keeps a mask of the digits which have already been
+placed in it, so that placing a value or removing a candidate is a handful of
+bit operations rather than a scan over the neighbouring cells.
+
+The lookup tables below are those of the standard 9x9 board, the tables for
+other sizes are held by their Geometry.
+"""
+
+from . import geometry
+
+ALL = geometry.STANDARD.ALL
+
+# Lookup tables indexed by candidate mask
+POPCOUNT = geometry.STANDARD.POPCOUNT
+DIGITS = geometry.STANDARD.DIGITS
+
+# Bit positions of each mask, counting from 0
+MEMBERS = geometry.STANDARD.MEMBERS
+
+# Every subset of a mask which has a given number of bits set
+subsets = geometry.STANDARD.subsets
+
+# Value of each character of a puzzle string
+_VALUES = {
+    symbol: value
+    for value, symbols in enumerate(
+        zip(geometry.SYMBOLS, geometry.SYMBOLS.lower()))
+    for symbol in symbols}
+_VALUES["."] = 0
+
+
+def parse(puzzle):
+    """
+    Convert a puzzle string, in which '0' or '.' represent an empty cell,
+    into a flat list of cell values. The size of the board is given by the
+    length of the string, so a 9x9 board has 81 characters. Values above 9
+    are written as letters, starting with 'A' for 10.
+    """
+
+    puzzle = puzzle.strip()
+    size = geometry.for_cells(len(puzzle)).SIZE
+    try:
+        values = [_VALUES[value] for value in puzzle]
+    except KeyError as error:
+        raise ValueError(f"Invalid character {error}") from None
+
+    if max(values) > size:
+        raise ValueError(f"Values of a {size}x{size} board can't exceed "
+                         f"'{geometry.SYMBOLS[size]}'")
+
+    return values
+
+
+def to_string(values):
+    """
+    Convert a flat list of cell values into a puzzle string, in which '0'
+    represents an empty cell
+    """
+
+    return "".join(map(geometry.SYMBOLS.__getitem__, values))
+
+
+def bit(digit):
+    """
+    Return the candidate mask containing only the specified digit
+    """
+
+    return 1 << (digit - 1)
+
+
+class Grid:
+    def __init__(self, values):
+        """
+        Create a new Grid object
+
+        arguments
+        ---------
+        values : list
+            A flat list of cell values, where 0 represents an empty cell. The
+            size of the board is given by the number of values, so a 9x9
+            board has 81
+        """
+
+        self.geometry = shape = geometry.for_cells(len(values))
+        self.values = [0] * shape.CELLS
+        self.masks = [shape.ALL] * shape.CELLS
+        self.seen = [0] * len(shape.UNITS)
+        self.conflict = False
+
+        # Every change made to the grid is recorded on the trail so that it
+        # can be rolled back with undo()
+        self.trail = []
+
+        # When set to a list, the index of every cell whose value or
+        # candidates change is appended to it
+        self.touched = None
+
+        for index, value in enumerate(values):
+            if value and not self.place(index, value):
+
+                # Keep conflicting givens on the board so they can still be
+                # displayed, the grid remains flagged as contradictory
+                self.values[index] = value
+                self.masks[index] = 0
+
+        self.trail = []
+
+    def copy(self):
+        """
+        Return an independent copy of this Grid, with an empty trail
+        """
+
+        grid = Grid.__new__(Grid)
+        grid.geometry = self.geometry
+        grid.values = self.values[:]
+        grid.masks = self.masks[:]
+        grid.seen = self.seen[:]
+        grid.conflict = self.conflict
+        grid.trail = []
+        grid.touched = None
+        return grid
+
+    def place(self, index, digit):
+        """
+        Place a digit in the specified cell and remove it as a candidate from
+        all of the cell's peers. Returns False if this leaves the grid in a
+        contradictory state.
+        """
+
+        if not self.assign(index, digit):
+            return False
+
+        mask = bit(digit)
+        masks = self.masks
+        for peer in self.geometry.PEERS[index]:
+            if masks[peer] & mask:
+                self.eliminate(peer, digit)
+
+        return not self.conflict
+
+    def assign(self, index, digit):
+        """
+        Set the value of the specified cell and mark the digit as seen in each
+        of the cell's units, without touching the cell's peers.
+        """
+
+        mask = bit(digit)
+        if self.values[index] or not self.masks[index] & mask:
+            self.conflict = True
+            return False
+
+        trail = self.trail
+        trail.append((self.values, index, 0))
+        trail.append((self.masks, index, self.masks[index]))
+        self.values[index] = digit
+        self.masks[index] = 0
+        if self.touched is not None:
+            self.touched.append(index)
+
+        seen = self.seen
+        for unit in self.geometry.UNITS_FOR[index]:
+            if seen[unit] & mask:
+                self.conflict = True
+
+            trail.append((seen, unit, seen[unit]))
+            seen[unit] |= mask
+
+        return True
+
+    def clear(self, index):
+        """
+        Remove the value from the specified cell, recalculating the candidates
+        of the cell and its peers from the values placed in their units. This
+        assumes that the only candidates which have been removed are those
+        ruled out by placed values, as is the case for a grid of givens.
+        """
+
+        if not self.values[index]:
+            return
+
+        shape = self.geometry
+        values = self.values
+        masks = self.masks
+        seen = self.seen
+        trail = self.trail
+
+        trail.append((values, index, values[index]))
+        values[index] = 0
+
+        for unit in shape.UNITS_FOR[index]:
+            mask = 0
+            for i in shape.UNITS[unit]:
+                if values[i]:
+                    mask |= bit(values[i])
+
+            trail.append((seen, unit, seen[unit]))
+            seen[unit] = mask
+
+        for i in shape.NEIGHBOURHOODS[index]:
+            if values[i]:
+                continue
+
+            row, column, square = shape.UNITS_FOR[i]
+            trail.append((masks, i, masks[i]))
+            masks[i] = shape.ALL & ~(seen[row] | seen[column] | seen[square])
+
+    def eliminate(self, index, digit):
+        """
+        Remove a digit from the candidates of the specified cell. Returns True
+        if the candidate was present.
+        """
+
+        return self.restrict(index, self.masks[index] & ~bit(digit))
+
+    def restrict(self, index, mask):
+        """
+        Restrict the candidates of the specified cell to those in the given
+        mask. Returns True if any candidates were removed.
+        """
+
+        old = self.masks[index]
+        new = old & mask
+        if new == old:
+            return False
+
+        self.trail.append((self.masks, index, old))
+        self.masks[index] = new
+        if self.touched is not None:
+            self.touched.append(index)
+        if not new and not self.values[index]:
+            self.conflict = True
+
+        return True
+
+    def propagate(self):
+        """
+        Repeatedly place sole candidates (cells with only one candidate) and
+        unique candidates (digits with only one position in a unit) until no
+        further progress can be made. Returns False if the grid is found to
+        be contradictory.
+        """
+
+        shape = self.geometry
+        everything = shape.ALL
+        popcount = shape.POPCOUNT
+        digits = shape.DIGITS
+        values = self.values
+        masks = self.masks
+        seen = self.seen
+
+        updated = True
+        while updated and not self.conflict:
+            updated = False
+
+            for index in range(shape.CELLS):
+                mask = masks[index]
+                if not values[index] and popcount[mask] == 1:
+                    self.place(index, digits[mask][0])
+                    updated = True
+
+            for unit, indexes in enumerate(shape.UNITS):
+
+                # Find the digits which can go in exactly one cell of the unit
+                once = twice = 0
+                for index in indexes:
+                    twice |= once & masks[index]
+                    once |= masks[index]
+
+                if once | seen[unit] != everything:
+                    self.conflict = True
+                    break
+
+                unique = once & ~twice
+                if not unique:
+                    continue
+
+                for index in indexes:
+                    mask = masks[index] & unique
+                    if not mask:
+                        continue
+
+                    if popcount[mask] > 1:
+                        self.conflict = True
+                        break
+
+                    self.place(index, digits[mask][0])
+                    updated = True
+
+        return not self.conflict
+
+    def mark(self):
+        """
+        Return a marker for the current state of the grid, which can later be
+        passed to undo()
+        """
+
+        return len(self.trail), self.conflict
+
+    def undo(self, marker):
+        """
+        Roll back every change made since the specified marker was taken
+        """
+
+        length, self.conflict = marker
+        trail = self.trail
+        while len(trail) > length:
+            target, index, old = trail.pop()
+            target[index] = old
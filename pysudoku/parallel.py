@@ -0,0 +1,358 @@
+import collections
+import concurrent.futures
+import itertools
+import os
+from .board import Board
+from .budget import Budget
+from .cache import SolutionCache, cache_key
+from .grid import parse, to_string
+from .sudoku import Sudoku
+
+
+def solve_many(puzzles, workers=None, chunksize=256, ordered=True,
+               engine="dlx", cache=None, timeout=None, max_nodes=None):
+    """
+    Solve a stream of puzzles using a pool of worker processes, generating a
+    (puzzle, solution) tuple for each one. Puzzles are sent to the workers as
+    strings, of 81 characters for a 9x9 puzzle, and the solution is also
+    returned as a string, or None if the puzzle has no solution.
+
+    arguments
+    ---------
+    puzzles : iterable
+        Puzzles to solve, each either a string, a two dimensional list, a
+        Sudoku or a Board
+
+    workers : int
+        Number of worker processes, defaults to the number of CPUs. When set
+        to 1 the puzzles are solved in the current process
+
+    chunksize : int
+        Number of puzzles sent to a worker at a time
+
+    ordered : boolean
+        Generate results in the same order as the puzzles, rather than as
+        soon as they have been solved
+
+    engine : str
+        Engine used to solve each puzzle, see Sudoku.solve, or "batch" to
+        solve each chunk at once using pysudoku.batch, which requires numpy
+
+    cache : SolutionCache
+        Cache which is checked for the solution of each puzzle before it is
+        sent to a worker, and which remembers the solutions found. A
+        SolutionStore can also be used as a read-only cache. Results are
+        always generated in order when a cache is used
+
+    timeout : float
+        Seconds each puzzle may take, after which solving it stops and its
+        solution is None, so that one puzzle can't hold a worker for long.
+        Not supported by the "batch" engine
+
+    max_nodes : int
+        Number of guesses each puzzle may make, see Budget
+    """
+
+    puzzles = (as_string(puzzle) for puzzle in puzzles)
+    options = (engine, timeout, max_nodes)
+    if cache is None:
+        return map_chunks(
+            solve_chunk, puzzles, workers, chunksize, ordered, *options)
+
+    return _solve_cached(puzzles, cache, workers, chunksize, options)
+
+
+def _solve_cached(puzzles, cache, workers, chunksize, options):
+    """
+    Solve a stream of puzzles, answering those found in the cache directly
+    and sending the rest to the workers. The keys a SolutionCache looks
+    puzzles up by are found by the workers too, and only a few chunks per
+    worker are read ahead of the results, so the puzzles are streamed in
+    constant memory however many of them are found in the cache. The
+    options are passed on to solve_chunk.
+    """
+
+    keyed = isinstance(cache, SolutionCache)
+    items = iter(puzzles)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            batch = _Batch(chunk)
+            batch.look_up(cache, _key_chunk(chunk) if keyed else None)
+            if batch.misses:
+                batch.solved(cache, solve_chunk(batch.misses, *options))
+
+            yield from batch.results()
+        return
+
+    limit = 2 * workers
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+
+        def look_up(batch, keys):
+            batch.look_up(cache, keys)
+            if batch.misses:
+                batch.solving = executor.submit(
+                    solve_chunk, batch.misses, *options)
+
+        batches = collections.deque()
+        while True:
+            for chunk in itertools.islice(chunks, limit - len(batches)):
+                batch = _Batch(chunk)
+                if keyed:
+                    batch.keying = executor.submit(_key_chunk, chunk)
+                else:
+                    look_up(batch, None)
+
+                batches.append(batch)
+
+            if not batches:
+                return
+
+            # Send the misses of every chunk whose keys have been found to be
+            # solved, rather than only those of the oldest chunk
+            for batch in batches:
+                if batch.keying is not None and batch.keying.done():
+                    look_up(batch, batch.keying.result())
+                    batch.keying = None
+
+            batch = batches[0]
+            if batch.keying is not None:
+                look_up(batch, batch.keying.result())
+                batch.keying = None
+
+            # Cache hits before the first miss are generated without waiting
+            # for the misses to be solved
+            yield from batch.results()
+            if batch.solving is not None:
+                batch.solved(cache, batch.solving.result())
+                yield from batch.results()
+
+            batches.popleft()
+
+
+class _Batch:
+    """
+    A chunk of puzzles being solved with a cache, along with the solutions
+    found so far
+    """
+
+    def __init__(self, puzzles):
+        self.puzzles = puzzles
+        self.keys = None
+        self.solutions = None
+        self.misses = None
+        self.keying = None
+        self.solving = None
+        self.sent = 0
+
+    def look_up(self, cache, keys):
+        """
+        Look each puzzle up in the cache, given the key of each puzzle or
+        None if the cache doesn't need them
+        """
+
+        self.keys = keys or [None] * len(self.puzzles)
+        self.solutions = [
+            cache.get(puzzle, key)
+            for puzzle, key in zip(self.puzzles, self.keys)]
+        self.misses = [
+            puzzle for puzzle, solution in zip(self.puzzles, self.solutions)
+            if solution is None]
+
+    def solved(self, cache, solutions):
+        """
+        Record the solutions to the misses, and remember them in the cache
+        """
+
+        solutions = iter(solutions)
+        for number, solution in enumerate(self.solutions):
+            if solution is None:
+                solution = self.solutions[number] = next(solutions)
+                cache.put(self.puzzles[number], solution, self.keys[number])
+
+        self.misses = []
+
+    def results(self):
+        """
+        Generate a (puzzle, solution) tuple for each puzzle which hasn't been
+        generated yet, up to the first which is still being solved
+        """
+
+        while self.sent < len(self.puzzles):
+            number = self.sent
+            if self.misses and self.solutions[number] is None:
+                return
+
+            self.sent += 1
+            yield self.puzzles[number], self.solutions[number]
+
+
+def _key_chunk(chunk):
+    """
+    Return the cache key of each of a list of puzzle strings
+    """
+
+    return [cache_key(puzzle) for puzzle in chunk]
+
+
+def map_chunks(function, items, workers=None, chunksize=256, ordered=True,
+               *args):
+    """
+    Apply a function to chunks of items using a pool of worker processes,
+    generating an (item, result) tuple for each item. The function is called
+    with a list of items followed by any extra arguments, and must return a
+    list of results in the same order.
+
+    arguments
+    ---------
+    function : callable
+        Module level function to call in the worker processes
+
+    items : iterable
+        Items to process, these are read lazily
+
+    workers : int
+        Number of worker processes, defaults to the number of CPUs. When set
+        to 1 the items are processed in the current process
+
+    chunksize : int
+        Number of items sent to a worker at a time
+
+    ordered : boolean
+        Generate results in the same order as the items, rather than as soon
+        as they are available
+    """
+
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from zip(chunk, function(chunk, *args))
+        return
+
+    # Only keep a few chunks per worker in flight, so that the items are
+    # streamed rather than read into memory up front
+    limit = 2 * workers
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = collections.OrderedDict()
+        for chunk in chunks:
+            future = executor.submit(function, chunk, *args)
+            pending[future] = chunk
+            if len(pending) >= limit:
+                yield from _collect(pending, ordered)
+
+        while pending:
+            yield from _collect(pending, ordered)
+
+
+def _collect(pending, ordered):
+    """
+    Wait for in-flight chunks to be solved, generating their results. If the
+    results are ordered only the oldest chunk is collected, otherwise every
+    chunk which has been solved is.
+    """
+
+    if ordered:
+        done = [next(iter(pending))]
+    else:
+        done, _ = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+    for future in done:
+        chunk = pending.pop(future)
+        yield from zip(chunk, future.result())
+
+
+def as_string(puzzle):
+    """
+    Convert a puzzle into a string, which is how puzzles are sent to the
+    worker processes
+
+    arguments
+    ---------
+    puzzle : str
+        The puzzle to convert, either a string, a two dimensional list, a
+        Sudoku or a Board
+    """
+
+    if isinstance(puzzle, str):
+        return puzzle.strip()
+
+    if isinstance(puzzle, (Sudoku, Board)):
+        return puzzle.to_string()
+
+    return to_string(value for row in puzzle for value in row)
+
+
+def solve_chunk(chunk, engine="dlx", timeout=None, max_nodes=None):
+    """
+    Solve a list of puzzle strings, returning a list of solution strings in
+    which None stands for a puzzle that wasn't solved. This is the function
+    run in the worker processes, by solve_many and SolverService.
+
+    arguments
+    ---------
+    chunk : list
+        Puzzle strings to solve
+
+    engine : str
+        Engine used to solve the puzzles, see solve_many
+
+    timeout : float
+        Seconds each puzzle may take, see solve_string
+
+    max_nodes : int
+        Number of guesses each puzzle may make, see solve_string
+    """
+
+    if engine == "batch":
+        if timeout is not None or max_nodes is not None:
+            raise ValueError(
+                "The batch engine doesn't support timeout or max_nodes")
+
+        from . import batch
+        return batch.solve(chunk)
+
+    return [solve_string(puzzle, engine, timeout, max_nodes)
+            for puzzle in chunk]
+
+
+def solve_string(puzzle, engine="dlx", timeout=None, max_nodes=None):
+    """
+    Solve a single puzzle string, returning the solution as a string, or
+    None if the puzzle has no solution. With the "dlx" engine the puzzle is
+    solved directly from its values without creating a Sudoku.
+
+    arguments
+    ---------
+    puzzle : str
+        The puzzle to solve, with '0' or '.' representing an empty cell
+
+    engine : str
+        Engine used to solve the puzzle, see Sudoku.solve
+
+    timeout : float
+        Seconds the puzzle may take, after which solving stops and None is
+        returned
+
+    max_nodes : int
+        Number of guesses the puzzle may make, after which solving stops
+        and None is returned
+    """
+
+    budget = None
+    if timeout is not None or max_nodes is not None:
+        budget = Budget(timeout, max_nodes)
+
+    if engine == "dlx":
+        from . import dlx
+        solution = dlx.solve(parse(puzzle), budget)
+        return to_string(solution) if solution else None
+
+    sudoku = Sudoku.from_string(puzzle)
+    solved = sudoku.solve(engine=engine, budget=budget)
+    return sudoku.to_string() if solved else None
@@ -0,0 +1,193 @@
+from .grid import Grid
+
+
+class Search:
+    def __init__(self, propagate=None, on_guess=None, on_backtrack=None,
+                 budget=None):
+        """
+        Create a new Search object. The search repeatedly picks the cell with
+        the fewest remaining candidates, tries each candidate in turn and
+        propagates the consequences. Every change is made on the grid's
+        trail, so a failed guess is rolled back rather than re-derived. The
+        cells being guessed are kept on a stack rather than by recursion, so
+        the search can go as deep as the board requires.
+
+        arguments
+        ---------
+        propagate : callable
+            Called with the grid after every guess to apply further
+            deductions, returning False if the grid is contradictory.
+            Defaults to Grid.propagate
+
+        on_guess : callable
+            Called with the grid, cell index and digit after each guess
+
+        on_backtrack : callable
+            Called with the grid and cell index when every candidate of a
+            cell has been ruled out
+
+        budget : Budget
+            Budget charged for every guess, the search stops as if there
+            were no more solutions once it runs out
+        """
+
+        self.propagate = propagate or Grid.propagate
+        self.on_guess = on_guess
+        self.on_backtrack = on_backtrack
+        self.budget = budget
+        self.nodes = 0
+        self.depth = 0
+
+    def solve(self, grid):
+        """
+        Search for a solution, leaving it on the grid. If there is no
+        solution the grid is returned to its original state and False is
+        returned.
+        """
+
+        self.nodes = 0
+        self.depth = 0
+        marker = grid.mark()
+        if self._search(grid):
+            return True
+
+        grid.undo(marker)
+        return False
+
+    def count(self, grid, limit=None):
+        """
+        Count the solutions of the grid, stopping as soon as the limit is
+        reached. The grid is returned to its original state afterwards.
+
+        arguments
+        ---------
+        grid : Grid
+            The grid to search
+
+        limit : int
+            Stop counting once this many solutions have been found, or None
+            to count every solution
+        """
+
+        self.nodes = 0
+        marker = grid.mark()
+        count = self._count(grid, limit)
+        grid.undo(marker)
+        return count
+
+    def select(self, grid):
+        """
+        Return the index of the empty cell with the fewest candidates, or None
+        if every cell has a value
+        """
+
+        popcount = grid.geometry.POPCOUNT
+        values = grid.values
+        masks = grid.masks
+        best, best_count = None, grid.geometry.SIZE + 1
+        for index, mask in enumerate(masks):
+            if values[index]:
+                continue
+
+            count = popcount[mask]
+            if count < best_count:
+                best, best_count = index, count
+                if count <= 2:
+                    break
+
+        return best
+
+    def order(self, grid, index):
+        """
+        Return the candidates of the specified cell in the order in which
+        they should be tried
+        """
+
+        return grid.geometry.DIGITS[grid.masks[index]]
+
+    def _search(self, grid):
+
+        if not self.propagate(grid):
+            return False
+
+        index = self.select(grid)
+        if index is None:
+            return True
+
+        # Each entry is a cell being guessed, the candidates still to be
+        # tried in it and the marker to roll back to before trying each
+        budget = self.budget
+        stack = [(index, iter(self.order(grid, index)), grid.mark())]
+        while stack:
+            index, digits, marker = stack[-1]
+            grid.undo(marker)
+            for digit in digits:
+                if budget is not None and budget.charge():
+                    return False
+
+                self.nodes += 1
+                if grid.place(index, digit):
+                    if self.on_guess:
+                        self.on_guess(grid, index, digit)
+
+                    if self.propagate(grid):
+                        if len(stack) > self.depth:
+                            self.depth = len(stack)
+
+                        following = self.select(grid)
+                        if following is None:
+                            return True
+
+                        stack.append((
+                            following, iter(self.order(grid, following)),
+                            grid.mark()))
+                        break
+
+                grid.undo(marker)
+
+            else:
+                stack.pop()
+                if self.on_backtrack:
+                    self.on_backtrack(grid, index)
+
+        return False
+
+    def _count(self, grid, limit):
+
+        if not self.propagate(grid):
+            return 0
+
+        index = self.select(grid)
+        if index is None:
+            return 1
+
+        digits = grid.geometry.DIGITS
+        budget = self.budget
+        count = 0
+        stack = [(index, iter(digits[grid.masks[index]]), grid.mark())]
+        while stack:
+            index, candidates, marker = stack[-1]
+            grid.undo(marker)
+            for digit in candidates:
+                if budget is not None and budget.charge():
+                    return count
+
+                self.nodes += 1
+                if grid.place(index, digit) and self.propagate(grid):
+                    following = self.select(grid)
+                    if following is None:
+                        count += 1
+                        if limit is not None and count >= limit:
+                            return count
+                    else:
+                        stack.append((
+                            following, iter(digits[grid.masks[following]]),
+                            grid.mark()))
+                        break
+
+                grid.undo(marker)
+
+            else:
+                stack.pop()
+
+        return count
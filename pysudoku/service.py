@@ -0,0 +1,370 @@
+"""
+Asyncio front end for solving puzzles in a pool of worker processes.
+
+Puzzles passed to SolverService.solve are queued, and gathered into small
+batches which are solved by a pool of worker processes, so that solving never
+blocks the event loop. A new batch is sent as soon as a worker is free, so
+batches grow when the service is busy and a lone puzzle is sent on its own
+when it isn't. Only a limited number of batches are solved at once and only
+a limited number of puzzles can wait to be solved, beyond which solve waits
+for room in the queue, so a burst of requests slows callers down rather than
+using more and more memory.
+
+The service can also be run as a TCP server, which reads puzzles one per line
+and writes each solution on a line of its own, in the same order, with an
+empty line for a puzzle which has no solution.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+from .parallel import as_string, solve_chunk
+from .validation import check
+
+
+class SolverService:
+    def __init__(self, workers=None, batch_size=64, delay=0.001,
+                 max_pending=1024, max_batches=None, engine="dlx",
+                 timeout=None, max_nodes=None):
+        """
+        Create a new SolverService object. The service must be started, by
+        calling start() or using it as an async context manager, before
+        puzzles are solved.
+
+        arguments
+        ---------
+        workers : int
+            Number of worker processes, defaults to the number of CPUs
+
+        batch_size : int
+            Largest number of puzzles sent to a worker at a time
+
+        delay : float
+            Seconds to wait for more puzzles before sending a batch which
+            isn't full. Waiting longer makes larger batches, at the cost of
+            adding to the time taken to answer each puzzle
+
+        max_pending : int
+            Number of puzzles which can wait to be sent to a worker, beyond
+            which solve waits for room
+
+        max_batches : int
+            Number of batches solved at once, defaults to twice the number
+            of workers
+
+        engine : str
+            Engine used to solve each puzzle, see solve_many
+
+        timeout : float
+            Seconds each puzzle may take in a worker, after which its
+            solution is None, so that one puzzle can't hold a worker for long
+
+        max_nodes : int
+            Number of guesses each puzzle may make, see Budget
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.delay = delay
+        self.max_pending = max_pending
+        self.max_batches = max_batches or 2 * self.workers
+        self.engine = engine
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+
+        # Number of puzzles solved, and of batches they were sent in
+        self.solved = 0
+        self.batches = 0
+
+        self._queue = None
+        self._slots = None
+        self._executor = None
+        self._batcher = None
+        self._running = set()
+
+    async def start(self):
+        """
+        Start the worker processes and begin solving queued puzzles
+        """
+
+        if self._batcher is not None:
+            return
+
+        self._queue = asyncio.Queue(self.max_pending)
+        self._slots = asyncio.Semaphore(self.max_batches)
+        self._executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+
+        # Start the workers straight away rather than when the first batch is
+        # sent, so that they aren't forked holding copies of the sockets of
+        # connections open at the time, which would keep them from closing
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, os.getpid)
+        self._batcher = loop.create_task(self._batch())
+
+    async def close(self):
+        """
+        Wait for the puzzles being solved to finish, then stop the worker
+        processes. Puzzles which are still queued are cancelled.
+        """
+
+        if self._batcher is None:
+            return
+
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+        if self._running:
+            await asyncio.wait(self._running)
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self._batcher = None
+
+    async def solve(self, puzzle):
+        """
+        Solve a puzzle, returning the solution as a string, or None if the
+        puzzle has no solution or ran out of time or guesses. Raises a
+        ValueError straight away if the puzzle isn't valid, such as one with
+        a digit given twice in a row, rather than sending it to a worker.
+
+        arguments
+        ---------
+        puzzle : str
+            The puzzle to solve, either a string, a two dimensional list, a
+            Sudoku or a Board
+        """
+
+        if self._batcher is None:
+            raise RuntimeError("The service has not been started")
+
+        puzzle = as_string(puzzle)
+        check(puzzle)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((puzzle, future))
+        return await future
+
+    async def solve_many(self, puzzles):
+        """
+        Solve many puzzles at once, generating a (puzzle, solution) tuple for
+        each one as soon as it has been solved
+
+        arguments
+        ---------
+        puzzles : iterable
+            Puzzles to solve, see solve
+        """
+
+        async def solve(puzzle):
+            return puzzle, await self.solve(puzzle)
+
+        for result in asyncio.as_completed([solve(p) for p in puzzles]):
+            yield await result
+
+    async def _batch(self):
+        """
+        Gather queued puzzles into batches, sending each to a worker as soon
+        as one is free
+        """
+
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch = []
+        try:
+            while True:
+                await self._slots.acquire()
+                batch = [await queue.get()]
+
+                # Take every puzzle which is already waiting, then give
+                # others a short time to arrive if the batch isn't full
+                deadline = loop.time() + self.delay
+                while len(batch) < self.batch_size:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                task = loop.create_task(self._dispatch(batch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                batch = []
+
+        except asyncio.CancelledError:
+
+            # Puzzles gathered into a batch which was never sent are
+            # cancelled, along with those still queued, when the service
+            # is closed
+            for _, future in batch:
+                future.cancel()
+
+            raise
+
+    async def _dispatch(self, batch):
+        """
+        Solve a batch of puzzles in a worker, and pass each solution back to
+        the caller waiting for it
+        """
+
+        loop = asyncio.get_running_loop()
+        puzzles = [puzzle for puzzle, _ in batch]
+        try:
+            solutions = await loop.run_in_executor(
+                self._executor, solve_chunk, puzzles, self.engine,
+                self.timeout, self.max_nodes)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            self.solved += len(batch)
+            self.batches += 1
+            for (_, future), solution in zip(batch, solutions):
+                if not future.done():
+                    future.set_result(solution)
+        finally:
+            self._slots.release()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __repr__(self):
+        return ("pysudoku.SolverService("
+                f"workers={self.workers}, "
+                f"solved={self.solved}, "
+                f"batches={self.batches})")
+
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    """
+    Run a TCP server which solves puzzles, until it is cancelled. Each line
+    received is a puzzle, and the reply to it is a line holding its
+    solution, an empty line if it has no solution, or a line starting with
+    "error:" if it isn't a valid puzzle. Replies are written in the same
+    order as the puzzles, and a client can send many puzzles without waiting
+    for the replies.
+
+    arguments
+    ---------
+    host : str
+        Address to listen on
+
+    port : int
+        Port to listen on
+
+    options : dict
+        Arguments used to create the SolverService
+    """
+
+    async with SolverService(**options) as service:
+        server = await asyncio.start_server(
+            functools.partial(_handle, service), host, port)
+        async with server:
+            await server.serve_forever()
+
+
+async def _handle(service, reader, writer):
+    """
+    Answer the puzzles sent over one connection
+    """
+
+    # The replies, in the order the puzzles arrived. This is bounded so that
+    # a client which doesn't read its replies stops being read from.
+    replies = asyncio.Queue(service.max_pending)
+
+    async def respond():
+        while True:
+            reply = await replies.get()
+            if reply is None:
+                return
+
+            writer.write((await reply + "\n").encode("ascii"))
+            await writer.drain()
+
+    async def put(reply):
+
+        # Only wait for room in the queue while the responder is running, as
+        # once it has stopped nothing takes replies off it
+        if not replies.full():
+            replies.put_nowait(reply)
+            return True
+
+        putting = loop.create_task(replies.put(reply))
+        await asyncio.wait(
+            (putting, responder), return_when=asyncio.FIRST_COMPLETED)
+        if putting.done():
+            return True
+
+        putting.cancel()
+        if reply is not None:
+            reply.cancel()
+        return False
+
+    loop = asyncio.get_running_loop()
+    responder = loop.create_task(respond())
+    try:
+        while not responder.done():
+            try:
+                line = await reader.readline()
+            except ConnectionError:
+                break
+
+            if not line:
+                break
+
+            puzzle = line.decode("ascii", "replace").strip()
+            if puzzle:
+                if not await put(loop.create_task(_answer(service, puzzle))):
+                    break
+
+        if not responder.done() and await put(None):
+            await asyncio.wait((responder,))
+    finally:
+        responder.cancel()
+
+        # Replies which were never written, because the client went away or
+        # couldn't be written to, are cancelled rather than left running
+        while not replies.empty():
+            reply = replies.get_nowait()
+            if reply is not None:
+                reply.cancel()
+
+        # The responder stops with an error when the connection is reset,
+        # which is expected, so it is retrieved here rather than reported
+        if responder.done() and not responder.cancelled():
+            responder.exception()
+
+        writer.close()
+
+
+async def _answer(service, puzzle):
+    """
+    Return the reply to a puzzle sent to the server
+    """
+
+    try:
+        solution = await service.solve(puzzle)
+    except Exception as error:
+        return f"error: {error}"
+
+    return solution or ""
@@ -0,0 +1,89 @@
+import collections
+
+
+class Stats:
+    def __init__(self):
+        """
+        Create a new Stats object, which counts the work done while solving.
+        A Stats object can be passed to any number of solves, in which case
+        the counts are totals across all of them.
+
+        Functions added to hooks are called with the Stats object at the end
+        of every solve, for example to export the counts to a metrics system.
+        """
+
+        # For each technique, the number of times it was applied, the number
+        # of times it made progress and the total time spent in it
+        self.calls = collections.Counter()
+        self.hits = collections.Counter()
+        self.time = collections.defaultdict(float)
+
+        # Values placed and candidates eliminated by the techniques
+        self.placed = 0
+        self.eliminated = 0
+
+        # Guesses made by the backtracking search, and the deepest it went
+        self.nodes = 0
+        self.depth = 0
+
+        # Number of solves and the total time they took
+        self.solves = 0
+        self.wall_time = 0.0
+
+        self.hooks = []
+
+    def record(self, technique, hit, seconds):
+        """
+        Record a single application of a technique
+        """
+
+        self.calls[technique] += 1
+        self.time[technique] += seconds
+        if hit:
+            self.hits[technique] += 1
+
+    def record_search(self, search):
+        """
+        Record the guesses made by a Search
+        """
+
+        self.nodes += search.nodes
+        self.depth = max(self.depth, search.depth)
+
+    def finish(self, seconds):
+        """
+        Record the end of a solve which took the given number of seconds, and
+        call each of the hooks
+        """
+
+        self.solves += 1
+        self.wall_time += seconds
+        for hook in self.hooks:
+            hook(self)
+
+    def as_dict(self):
+        """
+        Return the counts as a dictionary
+        """
+
+        return {
+            'calls': dict(self.calls),
+            'hits': dict(self.hits),
+            'time': dict(self.time),
+            'placed': self.placed,
+            'eliminated': self.eliminated,
+            'nodes': self.nodes,
+            'depth': self.depth,
+            'solves': self.solves,
+            'wall_time': self.wall_time,
+        }
+
+    def __repr__(self):
+        """
+        """
+
+        return ("pysudoku.Stats("
+                f"solves={self.solves}, "
+                f"wall_time={self.wall_time:.6f}, "
+                f"nodes={self.nodes}, "
+                f"hits={self.hits})")
@@ -0,0 +1,259 @@
+"""
+Persistent, memory mapped store of solved puzzles.
+
+Each puzzle and its solution are packed into 41 bytes apiece by storing every
+cell in four bits, and the records are written sorted by puzzle. Opening a
+store maps the file into memory, so that a puzzle is found by a binary search
+over the file itself, without reading it into Python objects first. Packing
+keeps the order of the puzzle strings, so the records can be compared as
+bytes.
+
+File layout
+-----------
+header      8 byte magic number, followed by the number of records as a
+            little endian unsigned 64 bit integer
+records     41 byte packed puzzle followed by its 41 byte packed solution
+"""
+
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import tempfile
+from . import geometry
+
+MAGIC = b"PYSDKST1"
+HEADER = struct.Struct("<8sQ")
+PACKED = (geometry.CELLS + 1) // 2
+RECORD = 2 * PACKED
+
+
+def pack(puzzle):
+    """
+    Pack an 81 character puzzle string, with '0' or '.' representing an
+    empty cell, into 41 bytes
+    """
+
+    puzzle = puzzle.strip().replace(".", "0")
+    if len(puzzle) != geometry.CELLS or not puzzle.isdigit():
+        raise ValueError(f"Expected {geometry.CELLS} digits, got '{puzzle}'")
+
+    # Every cell is a digit from 0 to 9, so the puzzle can be read as
+    # hexadecimal to put one cell in each four bits
+    return bytes.fromhex(puzzle + "0" * (2 * PACKED - geometry.CELLS))
+
+
+def unpack(data):
+    """
+    Unpack 41 bytes into an 81 character puzzle string
+    """
+
+    return bytes(data).hex()[:geometry.CELLS]
+
+
+def write_store(path, pairs, runsize=1000000):
+    """
+    Write a store of solved puzzles. The records are sorted in runs which
+    are merged as the file is written, so a store larger than memory can be
+    built. If a puzzle appears more than once only one of its solutions is
+    kept, and puzzles without a solution are skipped, as are puzzles which
+    aren't 9x9 puzzles of digits. Returns the number of puzzles skipped for
+    not being 9x9.
+
+    arguments
+    ---------
+    path : str
+        File to write the store to
+
+    pairs : iterable
+        (puzzle, solution) tuples of 81 character strings, as generated by
+        solve_many
+
+    runsize : int
+        Number of records sorted in memory at a time
+    """
+
+    pairs = iter(pairs)
+    skipped = 0
+    with tempfile.TemporaryDirectory() as directory:
+        runs = []
+        while True:
+            # A run is ended by the end of the pairs rather than by having no
+            # records, as every pair in a run may have been skipped
+            records = []
+            count = 0
+            for puzzle, solution in itertools.islice(pairs, runsize):
+                count += 1
+                if solution is None:
+                    continue
+
+                try:
+                    records.append(pack(puzzle) + pack(solution))
+                except ValueError:
+                    skipped += 1
+
+            if not count:
+                break
+
+            records.sort()
+
+            run = os.path.join(directory, f"{len(runs)}.run")
+            with open(run, "wb") as file:
+                file.writelines(records)
+
+            runs.append(run)
+
+        files = [open(run, "rb") for run in runs]
+        try:
+            merged = heapq.merge(*(_read_records(file) for file in files))
+            _write_records(path, merged)
+        finally:
+            for file in files:
+                file.close()
+
+    return skipped
+
+
+def _read_records(file):
+    """
+    Generate the records of a run
+    """
+
+    while True:
+        record = file.read(RECORD)
+        if not record:
+            return
+
+        yield record
+
+
+def _write_records(path, records):
+    """
+    Write sorted records to a store, skipping repeated puzzles
+    """
+
+    count = 0
+    previous = None
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, 0))
+        for record in records:
+            puzzle = record[:PACKED]
+            if puzzle == previous:
+                continue
+
+            file.write(record)
+            previous = puzzle
+            count += 1
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, count))
+
+
+class SolutionStore:
+    def __init__(self, path):
+        """
+        Open a store of solved puzzles written by write_store. A store can be
+        passed as the cache to Sudoku.solve, solve_many or batch.solve, where
+        it acts as a read-only cache.
+
+        arguments
+        ---------
+        path : str
+            File containing the store
+        """
+
+        self._map = None
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a pysudoku store")
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or size != HEADER.size + self._count * RECORD:
+            self.close()
+            raise ValueError(f"'{path}' is not a pysudoku store")
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, puzzle, key=None):
+        """
+        Return the solution to an 81 character puzzle string as a string, or
+        None if the puzzle isn't in the store. Puzzles are looked up as they
+        are, so the key accepted by SolutionCache.get is ignored
+        """
+
+        solution = self._find(puzzle)
+        if solution is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return solution
+
+    def _find(self, puzzle):
+        """
+        Binary search the records for a puzzle, returning its solution
+        """
+
+        try:
+            key = pack(puzzle)
+        except ValueError:
+            return None
+
+        data = self._map
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * RECORD
+            found = data[start:start + PACKED]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return unpack(data[start + PACKED:start + RECORD])
+
+        return None
+
+    def put(self, puzzle, solution, key=None):
+        """
+        Stores are read-only, so solutions found while solving are not kept
+        """
+
+    def __iter__(self):
+        """
+        Generate every (puzzle, solution) tuple in the store, in order
+        """
+
+        data = self._map
+        for number in range(self._count):
+            start = HEADER.size + number * RECORD
+            yield (unpack(data[start:start + PACKED]),
+                   unpack(data[start + PACKED:start + RECORD]))
+
+    def __contains__(self, puzzle):
+        return self._find(puzzle) is not None
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """
+        Close the store
+        """
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
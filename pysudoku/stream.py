@@ -0,0 +1,86 @@
+"""
+Streaming reader and writer for the one puzzle per line format, in which each
+puzzle is a string read left to right, top to bottom, with '0' or '.'
+representing an empty cell. A 9x9 puzzle has 81 characters, and larger
+puzzles write the values above 9 as letters. Puzzles are read and written one
+line at a time, so files of any size can be processed in constant memory.
+"""
+
+from .grid import parse, to_string
+
+
+def read_puzzles(file):
+    """
+    Generate the puzzles in a file as strings. Blank lines and lines starting
+    with '#' are skipped, and a ValueError giving the line number is raised
+    for a puzzle of the wrong length or with a character which isn't a value.
+
+    arguments
+    ---------
+    file : file
+        Text file, or any other iterable of lines, such as sys.stdin
+    """
+
+    for number, puzzle in read_lines(file):
+        try:
+            parse(puzzle)
+        except ValueError as error:
+            raise ValueError(f"Line {number}: {error}") from None
+
+        yield puzzle
+
+
+def read_lines(file):
+    """
+    Generate a (line number, puzzle) tuple for each line of a file which
+    holds a puzzle, skipping blank lines and lines starting with '#'. Unlike
+    read_puzzles the puzzles aren't checked, so that a caller can report the
+    line of each bad one and carry on.
+
+    arguments
+    ---------
+    file : file
+        Text file, or any other iterable of lines, such as sys.stdin
+    """
+
+    for number, line in enumerate(file, start=1):
+        puzzle = line.strip()
+        if puzzle and not puzzle.startswith("#"):
+            yield number, puzzle
+
+
+def write_puzzles(file, puzzles, blank="0"):
+    """
+    Write puzzles to a file, one per line. A puzzle of None is written as an
+    empty line, so that the output stays aligned with the input when some
+    puzzles have no solution.
+
+    arguments
+    ---------
+    file : file
+        Text file, or any other object with a write method, such as
+        sys.stdout
+
+    puzzles : iterable
+        Puzzles to write, each either a string, a flat list of cell values or
+        a Sudoku object
+
+    blank : str
+        Character used to represent an empty cell
+    """
+
+    for puzzle in puzzles:
+        if puzzle is None:
+            file.write("\n")
+            continue
+
+        if not isinstance(puzzle, str):
+            puzzle = (puzzle.to_string() if hasattr(puzzle, "to_string")
+                      else to_string(puzzle))
+
+        if blank != ".":
+            puzzle = puzzle.replace(".", blank)
+        if blank != "0":
+            puzzle = puzzle.replace("0", blank)
+
+        file.write(puzzle + "\n")
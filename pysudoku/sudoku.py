@@ -1,6 +1,81 @@
-import itertools
+import collections
+import functools
+import time
+from . import geometry
+from .budget import BudgetExceeded
 from .cell import Cell
-from .logger import InteractiveLogger
+from .grading import Grade
+from .grid import Grid, parse, to_string
+from .search import Search
+from .stats import Stats
+from .trace import (
+    Event, InteractiveTracer, RecordingTracer, Step, FOUND, PLACED,
+    ELIMINATED, STEP, GUESS, BACKTRACK)
+from .validation import check
+
+# Registry of solving techniques in the order in which they are tried, along
+# with what they are applied to. Each technique is implemented by a method
+# named _identify_<technique>.
+#
+#   cell    Applied to a Cell, and only depends on that cell
+#   peers   Applied to a Cell, and depends on every cell which shares a unit
+#           with it
+#   unit    Applied to a row, column or square, given by its index in
+#           geometry.UNITS
+#   digit   Applied to a digit across the whole board
+TECHNIQUES = (
+    ('sole_candidate', 'cell'),
+    ('unique_candidate', 'peers'),
+    ('naked_subsets', 'unit'),
+    ('hidden_subsets', 'unit'),
+    ('pointing_candidates', 'unit'),
+    ('box_line_reduction', 'unit'),
+    ('x_wing', 'digit'),
+    ('swordfish', 'digit'))
+
+# Sizes of the naked and hidden subsets which are looked for
+SUBSET_SIZES = (2, 3, 4)
+
+
+@functools.lru_cache(maxsize=None)
+def _neighbours(shape):
+    """
+    For each scope, the targets that need to be looked at again when a cell
+    of a board with the given Geometry changes
+    """
+
+    return {
+        'cell': tuple((index,) for index in range(shape.CELLS)),
+        'peers': shape.NEIGHBOURHOODS,
+        'unit': shape.UNITS_FOR,
+        'digit': (tuple(range(shape.SIZE)),) * shape.CELLS,
+    }
+
+
+def _targets(shape):
+    """
+    Targets of the techniques with each scope, other than those applied to
+    a Cell, on a board with the given Geometry
+    """
+
+    return {
+        'unit': range(len(shape.UNITS)),
+        'digit': range(1, shape.SIZE + 1),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _template(box):
+    """
+    Return the template used to display a board made up of box x box
+    squares, with a pair of braces for each cell
+    """
+
+    border = "+" + "+".join(["-" * (2 * box + 1)] * box) + "+"
+    row = "|" + "|".join([" {}" * box + " "] * box) + "|"
+    band = "\n".join([row] * box)
+    return "\n".join([border] + [band, border] * box)
+
 
 class Sudoku:
     def __init__(self, sudoku):
@@ -11,14 +86,82 @@ class Sudoku:
         ---------
         sudoku : list
             A two dimensional list which represents a partially complete
-            sudoku grid
+            sudoku grid. The grid is usually 9x9, but can be any size whose
+            squares are 2x2 to 5x5, such as 16x16 or 25x25. Raises a
+            ValueError if the rows aren't all the right length or a value is
+            out of range. Givens which conflict with each other are allowed,
+            but leave the Sudoku unsolvable, see pysudoku.validation
         """
 
-        # Create list of Cell objects
+        check(sudoku, conflicts=False, rows=True)
+
+        # Load the values into the board core, then create a list of Cell
+        # objects which act as views onto it
+        self.grid = Grid([value for row in sudoku for value in row])
+        self.geometry = shape = self.grid.geometry
         self.cells = []
-        for r in range(9):
-            for c in range(9):
-                self.cells.append(Cell(r, c, sudoku[r][c], self.cells))
+        for r in range(shape.SIZE):
+            for c in range(shape.SIZE):
+                self.cells.append(Cell(r, c, self.grid, self.cells))
+
+        # Solving techniques in the order in which they are tried, along with
+        # the cells or units they are applied to
+        self._techniques = [
+            (technique, getattr(self, f"_identify_{technique}"))
+            for technique, _ in TECHNIQUES]
+        targets = _targets(shape)
+        self._targets = [
+            targets.get(scope, self.cells) for _, scope in TECHNIQUES]
+        self._active = [True] * len(TECHNIQUES)
+
+        # Each technique has a queue of the targets it still needs to look
+        # at. To begin with this is every target, then the grid reports each
+        # cell that changes so that only the targets affected are queued
+        # again.
+        neighbours = _neighbours(shape)
+        self._neighbours = [neighbours[scope] for _, scope in TECHNIQUES]
+        self._queue_everything()
+
+        # Grade and Stats which are being recorded while solving, and the
+        # Budget limiting the solve, if any
+        self._grade = None
+        self._stats = None
+        self._budget = None
+
+        # Stats recorded by the most recent solve which asked for them
+        self.stats = None
+
+    def _queue_everything(self):
+        """
+        Queue every target of every technique, and start recording the cells
+        which change
+        """
+
+        self._queues = [
+            collections.deque(range(len(targets)))
+            for targets in self._targets]
+        self._queued = [
+            bytearray(b'\x01' * len(targets)) for targets in self._targets]
+        self.grid.touched = []
+
+    @classmethod
+    def from_string(cls, puzzle):
+        """
+        Create a new Sudoku object from a string, in which '0' or '.'
+        represent an empty cell. A 9x9 board has 81 characters, and larger
+        boards write the values above 9 as letters, see pysudoku.grid.parse
+        """
+
+        values = parse(puzzle)
+        size = geometry.for_cells(len(values)).SIZE
+        return cls([values[r * size:(r + 1) * size] for r in range(size)])
+
+    def to_string(self):
+        """
+        Return the Sudoku as a string, in which '0' represents an empty cell
+        """
+
+        return to_string(self.grid.values)
 
     @property
     def solved(self):
@@ -26,9 +169,39 @@ class Sudoku:
         Returns True if all Cells in the Sudoku have been solved, or False if
         they have not
         """
-        return True if all([c.solved for c in self.cells]) else False
+        return 0 not in self.grid.values
 
-    def solve(self, fallback_to_bruteforce=True, interactive=False):
+    def count_solutions(self, limit=2):
+        """
+        Count the number of solutions to the Sudoku, stopping as soon as the
+        limit is reached. The search runs on a copy of the board, so the
+        Sudoku itself is left unchanged.
+
+        arguments
+        ---------
+        limit : int
+            Stop counting once this many solutions have been found, or None
+            to count every solution
+        """
+
+        if self.geometry.SIZE <= 16:
+            return Search().count(self.grid.copy(), limit)
+
+        # On 25x25 boards a search which only places singles makes far too
+        # many guesses, so every technique is applied after each guess
+        sudoku = Sudoku.from_string(self.to_string())
+        return sudoku._search().count(sudoku.grid, limit)
+
+    def has_unique_solution(self):
+        """
+        Returns True if the Sudoku has exactly one solution
+        """
+
+        return self.count_solutions(limit=2) == 1
+
+    def solve(self, fallback_to_bruteforce=True, interactive=False,
+              engine="techniques", trace=None, techniques=None, cache=None,
+              stats=None, budget=None):
         """
         Attempt to solve the Sudoku by using a range of techniques, falling
         back to using a backtracking algorithm if we fail
@@ -37,26 +210,275 @@ class Sudoku:
         ---------
         interactive : boolean
             Run interactively and print verbose messages at each step
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken, this takes
+            the place of the interactive display
+
+        engine : str
+            Either "techniques" to solve as described above, or "dlx" to
+            solve the Sudoku as an exact cover problem using dancing links
+
+        techniques : list
+            Names of the techniques to use, from those in TECHNIQUES.
+            Defaults to all of them
+
+        cache : SolutionCache
+            Cache which is checked for the solution of an equivalent puzzle
+            before solving, and which remembers the solution afterwards. A
+            SolutionStore can also be used as a read-only cache
+
+        stats : Stats
+            Stats object which counts the work done while solving, or True
+            to use a new one. The Stats object is kept in the stats
+            attribute afterwards
+
+        budget : Budget
+            Limits on the time taken and guesses made. If the Budget runs out
+            before the Sudoku is solved, solving stops and a BudgetExceeded
+            is returned in place of False, holding the reason and the Stats
+            recorded so far
         """
 
-        while not self.solved:
-            updated = False
-            for cell in self.cells:
-                if cell.solved:
-                    continue
+        arguments = (fallback_to_bruteforce, interactive, engine, trace,
+                     techniques, cache)
 
-                if self.solve_cell(cell, interactive):
-                    updated = True
+        # Stats are always recorded under a budget, so that the work done so
+        # far can be reported if it runs out
+        if stats is None and budget is not None:
+            stats = True
 
-            if not updated:
-                break
+        if stats is None:
+            return self._solve(*arguments)
+
+        if stats is True:
+            stats = Stats()
+
+        self.stats = self._stats = stats
+        self._budget = budget
+        start = time.perf_counter()
+        try:
+            solved = self._solve(*arguments)
+        finally:
+            self._stats = None
+            self._budget = None
+            stats.finish(time.perf_counter() - start)
+
+        if not solved and budget is not None and budget.reason is not None:
+            return BudgetExceeded(budget, stats)
+
+        return solved
+
+    def _solve(self, fallback_to_bruteforce, interactive, engine, trace,
+               techniques, cache):
+        """
+        Solve the Sudoku, see solve()
+        """
+
+        if cache is not None:
+            puzzle = self.to_string()
+            solution = cache.get(puzzle)
+            if solution is not None:
+                return self._fill(parse(solution))
+
+            solved = self._solve(
+                fallback_to_bruteforce, interactive, engine, trace, techniques,
+                None)
+            if solved:
+                cache.put(puzzle, self.to_string())
 
-        if not self.solved and fallback_to_bruteforce:
-            self.solve_with_backtracking(interactive=interactive)
+            return solved
+
+        if engine == "dlx":
+            return self._solve_with_dlx()
+
+        if engine != "techniques":
+            raise ValueError(f"Unknown engine '{engine}'")
+
+        self._select_techniques(techniques)
+
+        if interactive and trace is None:
+            trace = InteractiveTracer(self)
+
+        self._propagate(trace)
+
+        if not self.solved and fallback_to_bruteforce and not self.grid.conflict:
+
+            # Only the techniques needed before resorting to backtracking
+            # count towards the grade, along with the number of guesses
+            grade, self._grade = self._grade, None
+            search = self._search(trace)
+            self.solve_with_backtracking(engine=search)
+
+            self._grade = grade
+            if grade is not None:
+                grade.record('backtracking', search.nodes)
+
+            if self._stats is not None:
+                self._stats.record_search(search)
+
+        return self.solved
+
+    def grade(self, interactive=False, trace=None, techniques=None):
+        """
+        Solve the Sudoku, returning a Grade which records the techniques
+        required to do so and a difficulty score
+
+        arguments
+        ---------
+        interactive : boolean
+            Run interactively and print verbose messages at each step
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken
+
+        techniques : list
+            Names of the techniques to use, defaults to all of them
+        """
+
+        self._grade = Grade()
+        try:
+            self.solve(
+                interactive=interactive, trace=trace, techniques=techniques)
+            return self._grade
+        finally:
+            self._grade = None
+
+    def _solve_with_dlx(self):
+        """
+        Solve the Sudoku using the dancing links exact cover solver
+        """
+
+        from . import dlx
+
+        solution = dlx.solve(self.grid.values, self._budget, self._stats)
+        if solution is None:
+            return False
+
+        return self._fill(solution)
+
+    def _fill(self, solution):
+        """
+        Fill in the empty cells from a flat list of solution values
+        """
+
+        for cell in self.cells:
+            if not cell.solved:
+                cell.update_value(solution[cell.index], solved=True)
 
         return self.solved
 
-    def solve_cell(self, cell, interactive=False):
+    def _select_techniques(self, techniques=None):
+        """
+        Choose which of the registered techniques are used
+        """
+
+        if techniques is None:
+            self._active = [True] * len(TECHNIQUES)
+            return
+
+        names = [technique for technique, _ in TECHNIQUES]
+        for technique in techniques:
+            if technique not in names:
+                raise ValueError(f"Unknown technique '{technique}'")
+
+        self._active = [name in techniques for name in names]
+
+    def _propagate(self, trace=None):
+        """
+        Apply the solving techniques until none of them can make any more
+        progress. Rather than sweeping the whole board, each technique works
+        through a queue of the cells whose neighbourhood has changed since it
+        last looked at them, and the easiest technique with work to do is
+        always run first, so that harder techniques are only used when they
+        are needed. Returns False if the board has been found to be
+        contradictory.
+        """
+
+        grid = self.grid
+        queues = self._queues
+        queued = self._queued
+        active = self._active
+        budget = self._budget
+
+        while not grid.conflict:
+            if budget is not None and budget.exceeded():
+                break
+
+            if grid.touched:
+                self._schedule()
+
+            for level, queue in enumerate(queues):
+                if queue and active[level]:
+                    break
+            else:
+                break
+
+            index = queue.popleft()
+            queued[level][index] = 0
+            self._apply(level, index, trace)
+
+        return not grid.conflict
+
+    def _apply(self, level, index, trace):
+        """
+        Apply a technique to one of its targets, returning True if it made
+        progress
+        """
+
+        technique, identify = self._techniques[level]
+        target = self._targets[level][index]
+
+        stats = self._stats
+        if stats is None:
+            found = identify(target, trace, False)
+        else:
+            start = time.perf_counter()
+            found = identify(target, trace, False)
+            stats.record(technique, found, time.perf_counter() - start)
+
+        if found:
+            if self._grade is not None:
+                self._grade.record(technique)
+
+            if trace is not None:
+                trace.emit(self._step(technique, level, index))
+
+        return found
+
+    def _step(self, technique, level, index):
+        """
+        Return the event marking the end of a step taken by a technique
+        """
+
+        scope = TECHNIQUES[level][1]
+        if scope == 'unit':
+            return Event(STEP, technique, unit=index)
+
+        if scope == 'digit':
+            return Event(STEP, technique, digit=self._targets[level][index])
+
+        return Event(STEP, technique, index)
+
+    def _schedule(self):
+        """
+        Queue the cells affected by every change the grid has reported since
+        the last time this was called
+        """
+
+        touched = set(self.grid.touched)
+        del self.grid.touched[:]
+
+        for neighbours, queue, queued in zip(
+                self._neighbours, self._queues, self._queued):
+            for index in touched:
+                for neighbour in neighbours[index]:
+                    if not queued[neighbour]:
+                        queued[neighbour] = 1
+                        queue.append(neighbour)
+
+    def solve_cell(self, cell, interactive=False, trace=None,
+                   techniques=None, stats=None):
         """
         Solve a specific cell by using a range of techniques
 
@@ -64,59 +486,278 @@ class Sudoku:
         ---------
         interactive : boolean
             Run interactively and print verbose messages at each step
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken
+
+        techniques : list
+            Names of the techniques to use, defaults to all of them
+
+        stats : Stats
+            Stats object which counts the techniques applied
         """
 
-        with InteractiveLogger(self, cell, interactive) as logger:
+        if interactive and trace is None:
+            trace = InteractiveTracer(self)
 
-            # Run through each solving method in turn
-            update = False
-            update = self._identify_sole_candidate(cell, logger, update)
-            update = self._identify_unique_candidate(cell, logger, update)
-            update = self._identify_naked_subsets(cell, logger, update)
-            update = self._identify_hidden_subsets(cell, logger, update)
+        self._select_techniques(techniques)
 
-            if not update:
-                logger.log(f"No action taken on {repr(cell)}")
+        if stats is None:
+            return self._solve_cell(cell, trace)
 
-            return update
+        self._stats = stats
+        try:
+            return self._solve_cell(cell, trace)
+        finally:
+            self._stats = None
 
-    def solve_with_backtracking(self, interactive=False):
+    def _solve_cell(self, cell, trace):
+        """
+        Solve a specific cell, see solve_cell()
+        """
+
+        # Run through each solving method in turn, stopping at the first one
+        # which makes progress. Techniques which work on a whole unit are
+        # applied to each of the units the cell belongs to, and those which
+        # work on a digit to each of the cell's candidates.
+        for level, (_, scope) in enumerate(TECHNIQUES):
+            if not self._active[level]:
+                continue
+            elif scope == 'unit':
+                targets = self.geometry.UNITS_FOR[cell.index]
+            elif scope == 'digit':
+                targets = self.geometry.MEMBERS[self.grid.masks[cell.index]]
+            else:
+                targets = (cell.index,)
+
+            for index in targets:
+                if self._apply(level, index, trace):
+                    return True
+
+        if trace is not None:
+            trace.emit(Event(STEP, None, cell.index))
+
+        return False
+
+    def steps(self, techniques=None):
+        """
+        Generate a Step for each deduction made by the solving techniques,
+        making one deduction each time the next Step is asked for, until
+        none of the techniques can make any more progress. The board can be
+        changed with place(), eliminate() and clear() in between steps, and
+        the next step takes those changes into account. The techniques keep
+        track of what they have already looked at, so each step only looks
+        at the parts of the board which have changed since the last one.
+
+        arguments
+        ---------
+        techniques : list
+            Names of the techniques to use, defaults to all of them
+        """
+
+        while True:
+            found = self._deduce(techniques)
+            if found is None:
+                return
+
+            yield found[2]
+
+    def next_hint(self, techniques=None):
+        """
+        Return a Step describing the next deduction the solving techniques
+        can make, without making it, or None if there isn't one. Asking again
+        without changing the board returns the same hint straight away.
+
+        arguments
+        ---------
+        techniques : list
+            Names of the techniques to use, defaults to all of them
+        """
+
+        grid = self.grid
+        marker = grid.mark()
+        found = self._deduce(techniques)
+        if found is None:
+            return None
+
+        # Roll the deduction back, then put the target it was found in back
+        # at the front of its queue so that it is found again first next time
+        grid.undo(marker)
+        del grid.touched[:]
+        level, index, step = found
+        if not self._queued[level][index]:
+            self._queued[level][index] = 1
+            self._queues[level].appendleft(index)
+
+        for index, _ in step.placed:
+            self.cells[index].changed = False
+
+        return step
+
+    def _deduce(self, techniques):
+        """
+        Make the next deduction, returning the level and index of the target
+        it was found in along with a Step describing it, or None if none of
+        the techniques can make progress or the board is contradictory
         """
-        Solve the Sudoku using only a backtracking algorithm, attempting to
-        solve each cell in turn by taking the first possible candidate, then
-        continuing onto the next cell. When a point is reached where we cannot 
-        continue we backtrack and choose the next possible candidate.
+
+        self._select_techniques(techniques)
+
+        grid = self.grid
+        queues = self._queues
+        queued = self._queued
+        active = self._active
+        tracer = RecordingTracer()
+
+        while not grid.conflict:
+            if grid.touched:
+                self._schedule()
+
+            for level, queue in enumerate(queues):
+                if queue and active[level]:
+                    break
+            else:
+                return None
+
+            index = queue.popleft()
+            queued[level][index] = 0
+            if self._apply(level, index, tracer):
+                events = tuple(tracer.events)
+                return level, index, Step(
+                    self._techniques[level][0],
+                    tuple((e.index, e.digit) for e in events
+                          if e.kind == PLACED),
+                    tuple((e.index, e.digit) for e in events
+                          if e.kind == ELIMINATED),
+                    events)
+
+            del tracer.events[:]
+
+        return None
+
+    def place(self, cell, value):
+        """
+        Place a value in an empty Cell and remove it from the candidates of
+        the Cell's row, column and square, as when a player fills in a cell.
+        Raises a ValueError, leaving the board unchanged, if the Cell already
+        has a value or the value isn't one of its candidates.
+
+        arguments
+        ---------
+        cell : Cell
+            Cell to place the value in
+
+        value : int
+            Value to place
+        """
+
+        if cell.solved:
+            raise ValueError(f"{cell!r} already has a value")
+
+        if value not in cell.candidates:
+            raise ValueError(f"{value} is not a candidate of {cell!r}")
+
+        self._set_cell_value(cell, value, None)
+
+    def eliminate(self, cell, value):
+        """
+        Remove a value from the candidates of a Cell, returning True if it
+        was a candidate. Removing the last candidate of a Cell leaves the
+        board contradictory.
+
+        arguments
+        ---------
+        cell : Cell
+            Cell to remove the candidate from
+
+        value : int
+            Candidate to remove
+        """
+
+        return cell.remove_candidate(value)
+
+    def clear(self, cell):
+        """
+        Remove the value from a Cell, as when a player rubs out a mistake.
+        Candidates removed by the solving techniques may have depended on
+        the value, so the candidates of every cell are worked out again from
+        the values which remain, and the techniques start again from the
+        whole board. Candidates removed with eliminate() are restored too.
+
+        arguments
+        ---------
+        cell : Cell
+            Cell to clear
+        """
+
+        if not cell.solved:
+            return
+
+        values = self.grid.values[:]
+        values[cell.index] = 0
+        fresh = Grid(values)
+
+        grid = self.grid
+        grid.values[:] = fresh.values
+        grid.masks[:] = fresh.masks
+        grid.seen[:] = fresh.seen
+        grid.conflict = fresh.conflict
+        grid.trail = []
+        cell.changed = False
+        self._queue_everything()
+
+    def solve_with_backtracking(self, interactive=False, engine=None,
+                                trace=None):
+        """
+        Solve the Sudoku using a backtracking search. The search repeatedly
+        picks the cell with the fewest possible candidates and tries each of
+        them in turn, applying the solving techniques after every guess. When
+        a point is reached where we cannot continue we undo the changes made
+        since the last guess and choose the next possible candidate.
 
         arguments
         ---------
         interactive : bool
             Run interactively and print verbose messages at each step
+
+        engine : Search
+            Search engine to use in place of the default
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken
         """
 
-        for cell in self.cells:
-            if cell.solved or cell.value != 0:
-                continue
+        if interactive and trace is None:
+            trace = InteractiveTracer(self)
 
-            related_cell_values = [c.value for c in cell.related_cells]
-            for candidate in cell.candidates:
-                if candidate not in related_cell_values:
-                    with InteractiveLogger(self, cell, interactive) as logger:
-                        logger.log(f"Updating {repr(cell)} to {candidate}")
-                        cell.value = candidate
-                        cell.changed = True
+        if engine is None:
+            engine = self._search(trace)
 
-                    if self.solve_with_backtracking(interactive):
-                        return True
+        return engine.solve(self.grid)
 
-            with InteractiveLogger(self, cell, interactive) as logger:
-                logger.log(f"No valid candidates for {repr(cell)} - Backtracking")
-                cell.value = 0
-                cell.changed = False
-                return False
+    def _search(self, trace=None):
+        """
+        Return the default search engine, which applies the solving
+        techniques after every guess
+        """
+
+        cells = self.cells
+
+        def on_guess(grid, index, digit):
+            cells[index].changed = True
+            if trace is not None:
+                trace.emit(Event(GUESS, index=index, digit=digit))
+
+        def on_backtrack(grid, index):
+            trace.emit(Event(BACKTRACK, index=index))
 
-        return True
+        return Search(
+            propagate=lambda grid: self._propagate(trace),
+            on_guess=on_guess,
+            on_backtrack=on_backtrack if trace is not None else None,
+            budget=self._budget)
 
-    def _identify_sole_candidate(self, cell, logger, update):
+    def _identify_sole_candidate(self, cell, trace, update):
         """
         Attempt to update the specified Cell by looking for a sole candidate.
         A sole candidate is when there exists only one possible candidate
@@ -127,8 +768,8 @@ class Sudoku:
         cell : Cell
             Cell object to be updated
 
-        logger : InteractiveLogger
-            InteractiveLogger object used to log messages
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
 
         update : boolean
             Boolean to indicate if the Cell has been previously updated
@@ -137,12 +778,16 @@ class Sudoku:
         if update:
             return True
 
-        if len(cell.candidates) == 1:
-            logger.log(f"Sole candidate '{cell.candidates[0]}' found")
-            self._set_cell_value(cell, cell.candidates[0], logger)
+        mask = self.grid.masks[cell.index]
+        if self.geometry.POPCOUNT[mask] == 1:
+            value = self.geometry.DIGITS[mask][0]
+            if trace is not None:
+                trace.emit(Event(FOUND, 'sole_candidate', cell.index, value))
+
+            self._set_cell_value(cell, value, trace)
             return True
 
-    def _identify_unique_candidate(self, cell, logger, update):
+    def _identify_unique_candidate(self, cell, trace, update):
         """
         Attempt to update the specified Cell by looking for a unique
         candidate. A unique candidate is when a number can only exist in this
@@ -153,8 +798,8 @@ class Sudoku:
         cell : Cell
             Cell object to be updated
 
-        logger : InteractiveLogger
-            InteractiveLogger object used to log messages
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
 
         update : boolean
             Boolean to indicate if the Cell has been previously updated
@@ -162,37 +807,47 @@ class Sudoku:
         if update:
             return True
 
-        for value in cell.candidates:
-
-            for group, related_cells in cell.related_cells_as_dict.items():
-
-                # Collate list of possible values for this row/column/square
-                possible_candidates = []
-                for related_cell in related_cells:
-                    for candidate in related_cell.candidates:
-                        possible_candidates.append(candidate)
-
-                # If the value can't exist in the row/column/square then it
-                # must be unique to this cell
-                if value not in possible_candidates:
-                    logger.log(f"Unique candidate '{value}' found in {group}")
-                    self._set_cell_value(cell, value, logger)
-                    return True
-
-    def _identify_naked_subsets(self, cell, logger, update):
+        masks = self.grid.masks
+        mask = masks[cell.index]
+        if not mask:
+            return False
+
+        shape = self.geometry
+        for unit, peers in zip(shape.UNITS_FOR[cell.index],
+                               shape.UNIT_PEERS[cell.index]):
+
+            # Collate the possible values for the rest of this
+            # row/column/square
+            possible_candidates = 0
+            for index in peers:
+                possible_candidates |= masks[index]
+
+            # If a value can't exist anywhere else in the row/column/square
+            # then it must be unique to this cell
+            unique = mask & ~possible_candidates
+            if unique:
+                value = shape.DIGITS[unique][0]
+                if trace is not None:
+                    trace.emit(Event(
+                        FOUND, 'unique_candidate', cell.index, value, unit))
+
+                self._set_cell_value(cell, value, trace)
+                return True
+
+    def _identify_naked_subsets(self, unit, trace, update):
         """
-        Look for naked subsets. A naked subset exists when there are at least
-        two cells that can only contain the same range of candidates. In this
+        Look for naked subsets. A naked subset exists when N cells in a row,
+        column, or square can only contain the same N candidates. In this
         case those candidates can be removed from all other cells in the row,
         column, or square.
 
         arguments
         ---------
-        cell : Cell
-            Cell object to be updated
+        unit : int
+            Index into geometry.UNITS of the row, column, or square to search
 
-        logger : InteractiveLogger
-            InteractiveLogger object used to log messages
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
 
         update : boolean
             Boolean to indicate if the Cell has been previously updated
@@ -201,69 +856,71 @@ class Sudoku:
         if update:
             return True
 
-        # Collate list of possible combinations
-        combinations = []
-        for subset in range(2, 4):
-            if len(cell.candidates) not in range(2, subset + 1):
-                continue
+        shape = self.geometry
+        popcount = shape.POPCOUNT
+        members = shape.MEMBERS
+        masks = self.grid.masks
+        indexes = shape.UNITS[unit]
+
+        # Find the positions in the unit which are yet to be solved
+        unsolved = 0
+        for position, index in enumerate(indexes):
+            if masks[index]:
+                unsolved |= 1 << position
+
+        for size in SUBSET_SIZES:
+            if size >= popcount[unsolved]:
+                break
+
+            # Only cells with at most N candidates can be part of a subset
+            # of N cells
+            eligible = 0
+            for position in members[unsolved]:
+                if popcount[masks[indexes[position]]] <= size:
+                    eligible |= 1 << position
 
-            tmp = list(itertools.combinations(cell.candidates, subset))
-            combinations = combinations + tmp
-
-        # Loop over related cells, then check each cell to see if it can only
-        # contain the values in our combination. If it can contain anything 
-        # else then it cannot be part of a naked subset.
-        naked_subset_found = False
-        for group, related_cells in cell.related_cells_as_dict.items():
-            for combination in combinations:
-                matches = [cell]
-                for related_cell in related_cells:
-                    if len(related_cell.candidates) not in range(2, len(combination)):
-                        continue
-
-                    naked_cell_found = True
-                    for value in related_cell.candidates:
-                        if value not in combination:
-                            naked_cell_found = False
-
-                    if naked_cell_found:
-                        matches.append(related_cell)
-
-                # The number of naked cells must match the number of values 
-                # in the combination. For example a naked pair will have two
-                # cells which can only contain (the same) two numbers.
-                if len(matches) != len(combination):
+            # Look for N cells which between them only have N candidates
+            for subset in shape.subsets(eligible, size):
+                combination = 0
+                for position in members[subset]:
+                    combination |= masks[indexes[position]]
+
+                if popcount[combination] != size:
                     continue
 
-                cells_to_update = []
-                for related_cell in related_cells:
-                    if related_cell in matches or related_cell.solved:
-                        continue
+                cells_to_update = [
+                    self.cells[indexes[position]]
+                    for position in members[unsolved & ~subset]
+                    if masks[indexes[position]] & combination]
+
+                if not cells_to_update:
+                    continue
 
-                    cells_to_update.append(related_cell)
+                if trace is not None:
+                    trace.emit(Event(
+                        FOUND, 'naked_subsets', unit=unit,
+                        digits=shape.DIGITS[combination]))
 
-                if cells_to_update:
-                    logger.log(f"Naked subset {combination} found in {group}")
+                for value in shape.DIGITS[combination]:
+                    self._remove_candidate_from_cells(cells_to_update, value, trace)
 
-                for value in combination:
-                    if self._remove_candidate_from_cells(cells_to_update, value, logger):
-                        naked_subset_found = True
+                return True
 
-        return naked_subset_found
+        return False
 
-    def _identify_hidden_subsets(self, cell, logger, update):
+    def _identify_hidden_subsets(self, unit, trace, update):
         """
         Look for hidden subsets. A hidden subset exists when N digits can only
-        exist in N cells in a row, cell, or square. In this scenario all other
-        candidates in those cells can be removed.
+        exist in N cells in a row, column, or square. In this scenario all
+        other candidates in those cells can be removed.
 
         arguments
         ---------
-        cell : Cell
-            Cell object to be updated
+        unit : int
+            Index into geometry.UNITS of the row, column, or square to search
 
-        logger : InteractiveLogger
-            InteractiveLogger object used to log messages
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
 
         update : boolean
             Boolean to indicate if the Cell has been previously updated
@@ -272,76 +929,289 @@ class Sudoku:
         if update:
             return True
 
-        # Collate list of possible combinations
-        combinations = []
-        for subset in range(2, 4):
-            tmp = list(itertools.combinations(cell.candidates, subset))
-            combinations = combinations + tmp
+        shape = self.geometry
+        popcount = shape.POPCOUNT
+        members = shape.MEMBERS
+        grid = self.grid
+        masks = grid.masks
+        indexes = shape.UNITS[unit]
+
+        # Build a mask of the positions in the unit where each digit can go
+        positions = [0] * shape.SIZE
+        for position, index in enumerate(indexes):
+            for digit in members[masks[index]]:
+                positions[digit] |= 1 << position
+
+        # Digits which have already been placed can't be part of a subset
+        unplaced = shape.ALL & ~grid.seen[unit]
+
+        for size in SUBSET_SIZES:
+            if size >= popcount[unplaced]:
+                break
+
+            # Only digits with at most N positions can be part of a subset
+            # of N digits
+            eligible = 0
+            for digit in members[unplaced]:
+                if popcount[positions[digit]] <= size:
+                    eligible |= 1 << digit
 
-        hidden_subset_found = False
-        for group, related_cells in cell.related_cells_as_dict.items():
-            for combination in combinations:
-                matches = [cell]
-                for related_cell in related_cells:
+            # Look for N digits which between them can only go in N cells
+            for combination in shape.subsets(eligible, size):
+                subset = 0
+                for digit in members[combination]:
+                    subset |= positions[digit]
 
-                    hidden_cell_found = False
-                    for value in related_cell.candidates:
-                        if value in combination:
-                            hidden_cell_found = True
+                if popcount[subset] != size:
+                    continue
 
-                    if hidden_cell_found:
-                        matches.append(related_cell)
+                matches = [indexes[position] for position in members[subset]
+                           if masks[indexes[position]] & ~combination]
 
-                if len(matches) != len(combination):
+                if not matches:
                     continue
 
+                if trace is not None:
+                    trace.emit(Event(
+                        FOUND, 'hidden_subsets', unit=unit,
+                        digits=shape.DIGITS[combination]))
+
                 for match in matches:
-                    for value in match.candidates.copy():
-                        if value not in combination:
-                            if not hidden_subset_found:
-                                logger.log(f"Hidden subset {combination} "
-                                           f"found in {group}")
+                    for value in shape.DIGITS[masks[match] & ~combination]:
+                        self._remove_candidate_from_cells(
+                            [self.cells[match]],
+                            value,
+                            trace)
+
+                return True
+
+        return False
+
+    def _identify_pointing_candidates(self, unit, trace, update):
+        """
+        Look for pointing candidates. When every cell in a square which can
+        contain a number lies in the same row or column, that number must go
+        in this square, so it can be removed from the rest of the row or
+        column.
+
+        arguments
+        ---------
+        unit : int
+            Index into geometry.UNITS of the square to search
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
+
+        update : boolean
+            Boolean to indicate if the Cell has been previously updated
+        """
+
+        if update:
+            return True
 
-                            hidden_subset_found = True
-                            self._remove_candidate_from_cells(
-                                [match],
-                                value,
-                                logger)
+        if unit < 2 * self.geometry.SIZE:
+            return False
 
-        return hidden_subset_found
+        return self._intersection_removal(unit, 'pointing_candidates', trace)
 
-    def _set_cell_value(self, cell, value, logger):
+    def _identify_box_line_reduction(self, unit, trace, update):
+        """
+        Look for box/line reductions. When every cell in a row or column
+        which can contain a number lies in the same square, that number must
+        go in this row or column, so it can be removed from the rest of the
+        square.
+
+        arguments
+        ---------
+        unit : int
+            Index into geometry.UNITS of the row or column to search
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
+
+        update : boolean
+            Boolean to indicate if the Cell has been previously updated
+        """
+
+        if update:
+            return True
+
+        if unit >= 2 * self.geometry.SIZE:
+            return False
+
+        return self._intersection_removal(unit, 'box_line_reduction', trace)
+
+    def _intersection_removal(self, unit, technique, trace):
+        """
+        Look for numbers whose candidates in a unit all lie where it overlaps
+        another unit, and remove them from the rest of the other unit
+        """
+
+        digits = self.geometry.DIGITS
+        masks = self.grid.masks
+        intersections = self.geometry.INTERSECTIONS[unit]
+        for segment, unit_rest, other_rest in intersections:
+            inside = outside = 0
+            for index in segment:
+                inside |= masks[index]
+            for index in unit_rest:
+                outside |= masks[index]
+
+            confined = inside & ~outside
+            if not confined:
+                continue
+
+            cells_to_update = [self.cells[index] for index in other_rest
+                               if masks[index] & confined]
+
+            if not cells_to_update:
+                continue
+
+            if trace is not None:
+                trace.emit(Event(
+                    FOUND, technique, unit=unit, digits=digits[confined]))
+
+            for value in digits[confined]:
+                self._remove_candidate_from_cells(cells_to_update, value, trace)
+
+            return True
+
+        return False
+
+    def _identify_x_wing(self, digit, trace, update):
+        """
+        Look for an X-Wing. When a number can only go in the same two columns
+        in two different rows, it must go in those columns in those rows, so
+        it can be removed from the rest of both columns. The same applies with
+        rows and columns swapped.
+
+        arguments
+        ---------
+        digit : int
+            The number to search for
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
+
+        update : boolean
+            Boolean to indicate if the Cell has been previously updated
+        """
+
+        if update:
+            return True
+
+        return self._fish(digit, 2, 'x_wing', trace)
+
+    def _identify_swordfish(self, digit, trace, update):
+        """
+        Look for a Swordfish, which is an X-Wing across three rows and three
+        columns
+
+        arguments
+        ---------
+        digit : int
+            The number to search for
+
+        trace : Tracer
+            Tracer which receives an Event for each step taken, or None
+
+        update : boolean
+            Boolean to indicate if the Cell has been previously updated
+        """
+
+        if update:
+            return True
+
+        return self._fish(digit, 3, 'swordfish', trace)
+
+    def _fish(self, digit, size, technique, trace):
+        """
+        Look for N rows (or columns) in which a number can only go in the same
+        N columns (or rows), and remove the number from the rest of those
+        columns (or rows)
+        """
+
+        shape = self.geometry
+        popcount = shape.POPCOUNT
+        members = shape.MEMBERS
+        masks = self.grid.masks
+        mask = 1 << (digit - 1)
+
+        # Find where the number can go in each row and each column
+        rows = [0] * shape.SIZE
+        columns = [0] * shape.SIZE
+        for index, candidates in enumerate(masks):
+            if candidates & mask:
+                row, column = divmod(index, shape.SIZE)
+                rows[row] |= 1 << column
+                columns[column] |= 1 << row
+
+        for positions, cover in ((rows, shape.COLUMNS),
+                                 (columns, shape.ROWS)):
+
+            # Keep the lines in which the number has between two and N
+            # positions
+            lines = 0
+            for line, found in enumerate(positions):
+                if 2 <= popcount[found] <= size:
+                    lines |= 1 << line
+
+            for combination in shape.subsets(lines, size):
+                covered = 0
+                for line in members[combination]:
+                    covered |= positions[line]
+
+                if popcount[covered] != size:
+                    continue
+
+                cells_to_update = [
+                    self.cells[index]
+                    for position in members[covered]
+                    for line, index in enumerate(cover[position])
+                    if masks[index] & mask and not combination & (1 << line)]
+
+                if not cells_to_update:
+                    continue
+
+                if trace is not None:
+                    trace.emit(Event(FOUND, technique, digit=digit))
+
+                self._remove_candidate_from_cells(cells_to_update, digit, trace)
+                return True
+
+        return False
+
+    def _set_cell_value(self, cell, value, trace):
         """
         """
 
         cell.update_value(value, solved=True)
-        logger.log(f"Cell ({repr(cell)}) updated to '{value}'")
-        self._remove_candidate_from_cells(cell.related_cells, value, logger)
+        if self._stats is not None:
+            self._stats.placed += 1
+
+        if trace is not None:
+            trace.emit(Event(PLACED, index=cell.index, digit=value))
 
-    def _remove_candidate_from_cells(self, cells, value, logger):
+        self._remove_candidate_from_cells(cell.related_cells, value, trace)
+
+    def _remove_candidate_from_cells(self, cells, value, trace):
         """
         """
+        masks = self.grid.masks
+        mask = 1 << (value - 1)
         action_taken = False
         for cell in cells:
-            if value in cell.candidates:
-                cell.remove_candidate(value)
-                logger.log(f"Removed '{value}' from {repr(cell)}")
+            if masks[cell.index] & mask and cell.remove_candidate(value):
+                if self._stats is not None:
+                    self._stats.eliminated += 1
+
+                if trace is not None:
+                    trace.emit(Event(ELIMINATED, index=cell.index, digit=value))
+
                 action_taken = True
 
         return action_taken
 
     def __str__(self):
-        return (
-            "+-------+-------+-------+\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "+-------+-------+-------+\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "+-------+-------+-------+\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "| {} {} {} | {} {} {} | {} {} {} |\n"
-            "+-------+-------+-------+".format(*self.cells))
+        return _template(self.geometry.BOX).format(*self.cells)
+
@@ -0,0 +1,190 @@
+import collections
+import os
+
+GROUPS = ('row', 'column', 'square')
+
+# A single step taken by the solver. Fields which don't apply to an event are
+# None.
+#
+#   kind        One of the event kinds below
+#   technique   Name of the technique responsible for the event
+#   index       Index of the cell the event applies to
+#   digit       Digit which was placed, eliminated, guessed or found
+#   unit        Index into geometry.UNITS of the unit the event applies to
+#   digits      Digits which make up a subset
+Event = collections.namedtuple(
+    'Event', ['kind', 'technique', 'index', 'digit', 'unit', 'digits'])
+Event.__new__.__defaults__ = (None,) * len(Event._fields)
+
+# A single deduction made by Sudoku.steps() or Sudoku.next_hint(), made up
+# of the events emitted while making it
+#
+#   technique   Name of the technique which made the deduction
+#   placed      Tuple of (index, digit) pairs for the values placed
+#   eliminated  Tuple of (index, digit) pairs for the candidates removed
+#   events      Tuple of every Event emitted, ending with a STEP event
+Step = collections.namedtuple(
+    'Step', ['technique', 'placed', 'eliminated', 'events'])
+
+FOUND = 'found'
+PLACED = 'placed'
+ELIMINATED = 'eliminated'
+STEP = 'step'
+GUESS = 'guess'
+BACKTRACK = 'backtrack'
+
+
+class Tracer:
+    """
+    Receives an Event for every step taken while solving a Sudoku. This base
+    class ignores every event, subclasses override emit() to do something
+    with them.
+
+    The solver only creates events when a Tracer has been supplied, so
+    solving without one costs nothing.
+    """
+
+    def emit(self, event):
+        """
+        Handle a single solver event
+        """
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        """
+        Create a new RecordingTracer object, which keeps every event in a list
+        """
+
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class InteractiveTracer(Tracer):
+    def __init__(self, sudoku):
+        """
+        Create a new InteractiveTracer object, which prints the Sudoku along
+        with a description of each step and waits for the user to press enter
+        before continuing
+
+        arguments
+        ---------
+        sudoku : Sudoku
+            The Sudoku being solved
+        """
+
+        self.sudoku = sudoku
+        self.messages = []
+
+    def emit(self, event):
+        kind = event.kind
+        if kind == FOUND:
+            self.log(self._describe(event))
+
+        elif kind == PLACED:
+            cell = self.sudoku.cells[event.index]
+            self.log(f"Cell ({repr(cell)}) updated to '{event.digit}'")
+
+        elif kind == ELIMINATED:
+            cell = self.sudoku.cells[event.index]
+            self.log(f"Removed '{event.digit}' from {repr(cell)}")
+
+        elif kind == GUESS:
+            cell = self.sudoku.cells[event.index]
+            self.log(f"Updating {repr(cell)} to {event.digit}")
+            self.display(cell)
+
+        elif kind == BACKTRACK:
+            cell = self.sudoku.cells[event.index]
+            self.log(f"No valid candidates for {repr(cell)} - Backtracking")
+            self.display(cell)
+
+        elif kind == STEP:
+            cell = None
+            if event.index is not None:
+                cell = self.sudoku.cells[event.index]
+
+            if event.technique is None:
+                self.log(f"No action taken on {repr(cell)}")
+
+            self.display(cell)
+
+    def log(self, message):
+
+        self.messages.append(message)
+
+    def display(self, cell=None):
+        """
+        Print the Sudoku, with the specified cell highlighted, next to the
+        messages logged since the last time it was displayed, then wait for
+        the user to press enter
+        """
+
+        messages = ["Running in interactive mode, press enter to continue"]
+        messages += self.messages
+        self.messages = []
+
+        os.system("clear")
+        if cell is None:
+            lines_in_sudoku = str(self.sudoku).split("\n")
+        else:
+            with cell.highlighted():
+                lines_in_sudoku = str(self.sudoku).split("\n")
+
+        line_count = max(len(lines_in_sudoku), len(messages))
+
+        print()
+        print("  Sudoku                     |  Messages")
+        print("  ---------------------------|---------------------------")
+        for index in range(line_count):
+
+            try:
+                sudoku_line = lines_in_sudoku[index]
+            except IndexError:
+                sudoku_line = " " * len(lines_in_sudoku[0])
+
+            try:
+                message = messages[index]
+            except IndexError:
+                message = ""
+
+            print(f"  {sudoku_line}  |  {message}")
+
+        input()
+
+    def _describe(self, event):
+        """
+        Describe an event in which a technique found something
+        """
+
+        group = None
+        if event.unit is not None:
+            group = GROUPS[event.unit // self.sudoku.geometry.SIZE]
+
+        if event.technique == 'sole_candidate':
+            return f"Sole candidate '{event.digit}' found"
+
+        if event.technique == 'unique_candidate':
+            return f"Unique candidate '{event.digit}' found in {group}"
+
+        if event.technique == 'naked_subsets':
+            return f"Naked subset {event.digits} found in {group}"
+
+        if event.technique == 'hidden_subsets':
+            return f"Hidden subset {event.digits} found in {group}"
+
+        if event.technique == 'pointing_candidates':
+            return f"Pointing candidates {event.digits} found in {group}"
+
+        if event.technique == 'box_line_reduction':
+            return f"Box/line reduction {event.digits} found in {group}"
+
+        if event.technique == 'x_wing':
+            return f"X-Wing found for '{event.digit}'"
+
+        if event.technique == 'swordfish':
+            return f"Swordfish found for '{event.digit}'"
+
+        return f"{event.technique} found in {group}"
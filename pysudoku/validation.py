@@ -0,0 +1,318 @@
+"""
+Checks that a puzzle is well formed before it is solved.
+
+validate() looks at each cell of a puzzle once, keeping a mask of the digits
+given in each unit, and reports every Problem it finds along with the cells
+responsible. A puzzle with no problems may still have no solution, but those
+which break the rules outright are caught without any solving at all.
+validate_many() checks a whole file of 9x9 puzzles at once using NumPy.
+"""
+
+import collections
+import operator
+from . import geometry
+from .grid import bit, _VALUES
+from .trace import GROUPS
+
+# Something wrong with a puzzle. Cells is a tuple of the indexes of the cells
+# responsible, which is empty for a puzzle of the wrong shape.
+#
+#   shape           The puzzle doesn't have a supported number of cells, or
+#                   its rows aren't all the same length
+#   value           A cell holds something other than 0 to SIZE
+#   duplicate       A digit is given more than once in a unit
+#   no_candidates   An empty cell can't hold any digit
+#   no_position     A digit can't go anywhere in a unit
+Problem = collections.namedtuple('Problem', ['kind', 'cells', 'message'])
+
+SHAPE = 'shape'
+VALUE = 'value'
+DUPLICATE = 'duplicate'
+NO_CANDIDATES = 'no_candidates'
+NO_POSITION = 'no_position'
+
+
+def validate(puzzle, conflicts=True, rows=False):
+    """
+    Return a list of the Problems with a puzzle, which is empty if there are
+    none. If the puzzle is the wrong shape that is the only problem reported.
+
+    arguments
+    ---------
+    puzzle : str
+        The puzzle to check, either a string, a flat or two dimensional list
+        of values, a Sudoku or a Board
+
+    conflicts : bool
+        Whether to look for conflicts between the givens, or only check the
+        shape of the puzzle and its values
+
+    rows : bool
+        Only accept a sequence of rows, as Sudoku does, so that anything else
+        is reported as the wrong shape
+    """
+
+    values, problems = _values(puzzle, rows)
+    if problems:
+        return problems
+
+    shape = geometry.for_cells(len(values))
+    for index, value in enumerate(values):
+        if not _valid(value, shape.SIZE):
+            problems.append(Problem(
+                VALUE, (index,),
+                f"Invalid value {value!r} at {_position(shape, index)}"))
+
+    if not conflicts:
+        return problems
+
+    if problems:
+        bad = {index for problem in problems for index in problem.cells}
+        values = [0 if i in bad else value for i, value in enumerate(values)]
+
+    return problems + _conflicts(shape, values)
+
+
+def check(puzzle, conflicts=True, rows=False):
+    """
+    Raise a ValueError describing the problems with a puzzle, if it has any
+
+    arguments
+    ---------
+    puzzle : str
+        The puzzle to check, see validate
+
+    conflicts : bool
+        Whether to look for conflicts between the givens, see validate
+
+    rows : bool
+        Only accept a sequence of rows, see validate
+    """
+
+    problems = validate(puzzle, conflicts, rows)
+    if problems:
+        raise ValueError("; ".join(problem.message for problem in problems))
+
+
+def validate_many(puzzles):
+    """
+    Return a list holding a list of the Problems with each of many puzzle
+    strings. The 9x9 puzzles are checked all at once using NumPy, and only
+    those found to have problems are looked at one at a time to describe
+    them, so checking a large file costs little more than reading it.
+    Puzzles of other sizes are checked one at a time, as is every puzzle if
+    NumPy isn't installed.
+
+    arguments
+    ---------
+    puzzles : list
+        Puzzle strings, in which '0' or '.' represent an empty cell
+    """
+
+    try:
+        from .batch import np, candidates, BITS, UNITS, ALL
+    except ImportError:
+        return [validate(puzzle) for puzzle in puzzles]
+
+    puzzles = [puzzle.strip() for puzzle in puzzles]
+    results = [[] for _ in puzzles]
+
+    standard = [number for number, puzzle in enumerate(puzzles)
+                if len(puzzle) == geometry.CELLS and puzzle.isascii()]
+    suspect = sorted(set(range(len(puzzles))).difference(standard))
+
+    if standard:
+
+        # Characters other than digits and '.' become values above 9
+        text = [puzzles[number].replace(".", "0") for number in standard]
+        values = np.frombuffer(
+            "".join(text).encode("ascii"), dtype=np.uint8) - ord("0")
+        values = values.reshape(len(standard), geometry.CELLS)
+        bad = (values > geometry.SIZE).any(axis=1)
+        values = np.where(values > geometry.SIZE, 0, values)
+
+        # A unit contains a repeated digit exactly when the sum of its bits
+        # differs from their union, see batch.propagate
+        seen, masks = candidates(values)
+        bits = BITS[values][:, UNITS].sum(axis=2, dtype=np.uint32)
+        bad |= (bits != seen).any(axis=1)
+        bad |= ((values == 0) & (masks == 0)).any(axis=1)
+        possible = np.bitwise_or.reduce(masks[:, UNITS], axis=2) | seen
+        bad |= (possible != ALL).any(axis=1)
+
+        suspect += [standard[i] for i in np.flatnonzero(bad)]
+
+    for number in suspect:
+        results[number] = validate(puzzles[number])
+
+    return results
+
+
+def _values(puzzle, rows=False):
+    """
+    Return a puzzle as a flat list of values, along with a list of Problems
+    with its shape. Characters of a string which aren't values are left in
+    the list to be reported as invalid values. If rows is True the puzzle
+    must be a sequence of rows.
+    """
+
+    if rows:
+        return _rows(puzzle)
+
+    if isinstance(puzzle, str):
+        puzzle = puzzle.strip()
+        values = [_VALUES.get(character, character) for character in puzzle]
+
+    elif hasattr(puzzle, "grid"):
+        values = puzzle.grid.values
+
+    elif isinstance(puzzle, (bytes, bytearray)) or hasattr(puzzle, "values"):
+        values = list(getattr(puzzle, "values", puzzle))
+
+    else:
+        return _rows(puzzle, flat=True)
+
+    return _shape(values)
+
+
+def _rows(puzzle, flat=False):
+    """
+    Return a sequence of rows as a flat list of values, along with a list of
+    Problems with its shape, see _values. A flat sequence of values is only
+    accepted if flat is True.
+    """
+
+    wrong = Problem(
+        SHAPE, (), f"Expected a list of rows, got {type(puzzle).__name__}")
+    if isinstance(puzzle, str) and not flat:
+        return [], [wrong]
+
+    try:
+        puzzle = list(puzzle)
+    except TypeError:
+        return [], [wrong]
+
+    # Any sequence of rows counts as two dimensional, such as a list of
+    # lists, a list of bytes or a two dimensional NumPy array
+    if (puzzle and hasattr(puzzle[0], "__len__")
+            and not isinstance(puzzle[0], str)):
+        lengths = {len(row) for row in puzzle}
+        if lengths != {len(puzzle)}:
+            return [], [Problem(
+                SHAPE, (),
+                f"Expected {len(puzzle)} rows of {len(puzzle)} values, "
+                f"got rows of {', '.join(map(str, sorted(lengths)))}")]
+
+        return _shape([value for row in puzzle for value in row])
+
+    if not flat:
+        return [], [Problem(
+            SHAPE, (),
+            f"Expected a list of rows, got {len(puzzle)} values which "
+            f"aren't in rows")]
+
+    return _shape(puzzle)
+
+
+def _shape(values):
+    """
+    Return a flat list of values, along with a list holding a Problem if
+    there isn't a supported number of them
+    """
+
+    try:
+        geometry.for_cells(len(values))
+    except ValueError as error:
+        return [], [Problem(SHAPE, (), str(error))]
+
+    return values, []
+
+
+def _valid(value, size):
+    """
+    Return True if a value is an integer from 0 to size. Booleans are
+    integers to Python, but aren't values.
+    """
+
+    if isinstance(value, bool):
+        return False
+
+    try:
+        return 0 <= operator.index(value) <= size
+    except TypeError:
+        return False
+
+
+def _conflicts(shape, values):
+    """
+    Return the Problems caused by the givens of a puzzle whose values are
+    all valid
+    """
+
+    units_for = shape.UNITS_FOR
+    seen = [0] * len(shape.UNITS)
+    repeated = []
+
+    for index, value in enumerate(values):
+        if not value:
+            continue
+
+        mask = bit(value)
+        for unit in units_for[index]:
+            if seen[unit] & mask:
+                repeated.append((unit, value))
+            seen[unit] |= mask
+
+    problems = []
+    for unit, value in sorted(set(repeated)):
+        cells = tuple(i for i in shape.UNITS[unit] if values[i] == value)
+        problems.append(Problem(
+            DUPLICATE, cells,
+            f"{value} is given more than once in {_unit(shape, unit)}"))
+
+    # The candidates of each empty cell, and the digits which can still go
+    # somewhere in each unit
+    everything = shape.ALL
+    possible = seen[:]
+    for index, value in enumerate(values):
+        if value:
+            continue
+
+        row, column, square = units_for[index]
+        mask = everything & ~(seen[row] | seen[column] | seen[square])
+        if not mask:
+            problems.append(Problem(
+                NO_CANDIDATES, (index,),
+                f"No digit can go at {_position(shape, index)}"))
+            continue
+
+        possible[row] |= mask
+        possible[column] |= mask
+        possible[square] |= mask
+
+    for unit, mask in enumerate(possible):
+        missing = everything & ~mask
+        if missing:
+            digits = ", ".join(map(str, shape.DIGITS[missing]))
+            problems.append(Problem(
+                NO_POSITION, shape.UNITS[unit],
+                f"{digits} can't go anywhere in {_unit(shape, unit)}"))
+
+    return problems
+
+
+def _position(shape, index):
+    """
+    Describe the position of a cell
+    """
+
+    row, column = divmod(index, shape.SIZE)
+    return f"row {row}, column {column}"
+
+
+def _unit(shape, unit):
+    """
+    Describe a row, column or square
+    """
+
+    return f"{GROUPS[unit // shape.SIZE]} {unit % shape.SIZE}"
@@ -0,0 +1,70 @@
+import copy
+import pickle
+import pytest
+from pysudoku import boards
+from pysudoku.board import Board
+
+
+@pytest.mark.parametrize("name", sorted(boards.PUZZLES))
+def test_board_round_trip(name):
+    board = Board.from_string(boards.PUZZLES[name])
+    sudoku = board.to_sudoku()
+    assert sudoku.to_string() == boards.PUZZLES[name]
+    assert Board.from_sudoku(sudoku) == board
+
+
+def test_round_trip_keeps_candidates():
+    sudoku = boards.medium
+    sudoku.solve(fallback_to_bruteforce=False, techniques=["naked_subsets"])
+    board = Board.from_sudoku(sudoku)
+    assert Board.from_sudoku(board.to_sudoku()) == board
+
+
+
+def test_boards_are_immutable_and_hashable():
+    board = Board.from_string(boards.PUZZLES["easy"])
+    with pytest.raises(AttributeError):
+        board.values = bytes(81)
+
+    same = Board.from_string(boards.PUZZLES["easy"])
+    assert board == same and hash(board) == hash(same)
+    assert board != Board.from_string(boards.PUZZLES["hard"])
+    assert len({board, same}) == 1
+    assert copy.copy(board) is board and copy.deepcopy(board) is board
+
+
+def test_pickle_keeps_candidates():
+    sudoku = boards.hard
+    sudoku.solve(fallback_to_bruteforce=False)
+    board = Board.from_sudoku(sudoku)
+    assert pickle.loads(pickle.dumps(board)) == board
+
+
+def test_grid_round_trip():
+    sudoku = boards.medium
+    sudoku.solve(fallback_to_bruteforce=False, techniques=["naked_subsets"])
+    board = Board.from_sudoku(sudoku)
+    grid = board.to_grid()
+    assert grid.values == sudoku.grid.values
+    assert list(grid.masks) == list(sudoku.grid.masks)
+    assert Board.from_grid(grid) == board
+
+
+def test_solved():
+    assert not Board.from_string(boards.PUZZLES["easy"]).solved
+    sudoku = boards.easy
+    sudoku.solve()
+    assert Board.from_sudoku(sudoku).solved
+
+
+@pytest.mark.parametrize("size", [4, 16, 25])
+def test_other_sizes(size):
+    board = Board(bytes(size * size))
+    assert board.to_string() == "0" * size * size
+    assert set(board.masks) == {(1 << size) - 1}
+    assert Board.from_sudoku(board.to_sudoku()) == board
+
+
+def test_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        Board(bytes(80))
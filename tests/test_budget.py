@@ -0,0 +1,84 @@
+import threading
+import pytest
+from pysudoku import dlx
+from pysudoku.bench import load_corpus
+from pysudoku.budget import Budget, BudgetExceeded
+from pysudoku.grid import Grid, parse
+from pysudoku.parallel import solve_many, solve_string
+from pysudoku.search import Search
+from pysudoku.sudoku import Sudoku
+
+# A puzzle which needs more than a few guesses with either engine
+PUZZLE = load_corpus("killers")[0]
+ENGINES = ["techniques", "dlx"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_node_limit(engine):
+    sudoku = Sudoku.from_string(PUZZLE)
+    result = sudoku.solve(engine=engine, budget=Budget(max_nodes=5))
+    assert isinstance(result, BudgetExceeded) and not result
+    assert result.reason == "nodes"
+    assert result.nodes == 5
+    assert result.stats.nodes == 5
+    assert result.stats.depth > 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_time_limit(engine):
+    result = Sudoku.from_string(PUZZLE).solve(
+        engine=engine, budget=Budget(timeout=0))
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == "time"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cancellation(engine):
+    token = threading.Event()
+    token.set()
+    result = Sudoku.from_string(PUZZLE).solve(
+        engine=engine, budget=Budget(token=token))
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == "cancelled"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_generous_budget(engine):
+    sudoku = Sudoku.from_string(PUZZLE)
+    budget = Budget(timeout=60, max_nodes=100000)
+    assert sudoku.solve(engine=engine, budget=budget) is True
+    assert budget.reason is None
+    assert sudoku.stats.nodes == budget.nodes > 0
+
+
+def test_budget_records_first_reason():
+    budget = Budget(timeout=0, max_nodes=0)
+    assert budget.charge()
+    assert budget.reason == "nodes"
+    budget.max_nodes = None
+    assert budget.exceeded() and budget.reason == "nodes"
+
+
+def test_engines_stop_when_out_of_budget():
+    values = parse(PUZZLE)
+    budget = Budget(max_nodes=3)
+    assert dlx.solve(values, budget) is None
+    assert budget.nodes == 3
+
+    budget = Budget(max_nodes=3)
+    grid = Grid(values)
+    assert not Search(budget=budget).solve(grid)
+    assert budget.reason == "nodes"
+    assert grid.values == values
+
+
+def test_per_puzzle_limits():
+    assert solve_string(PUZZLE, max_nodes=5) is None
+    assert solve_string(PUZZLE, "techniques", timeout=0) is None
+    assert solve_string(PUZZLE, max_nodes=100000) == solve_string(PUZZLE)
+
+    results = list(solve_many([PUZZLE] * 3, workers=1, max_nodes=5))
+    assert [solution for _, solution in results] == [None] * 3
+
+    with pytest.raises(ValueError):
+        list(solve_many([PUZZLE], workers=1, engine="batch", timeout=1))
@@ -0,0 +1,139 @@
+import pickle
+import random
+import pytest
+from pysudoku import dlx
+from pysudoku.bench import load_corpus
+from pysudoku.cache import SolutionCache, cache_key
+from pysudoku.canonical import canonical_form, canonicalise
+from pysudoku.grid import parse, to_string
+from pysudoku.parallel import solve_many, solve_string
+
+PUZZLES = [to_string(parse(puzzle)) for corpus in ("easy", "hard")
+           for puzzle in load_corpus(corpus)[:10]]
+
+
+def scramble(puzzle, seed):
+    """
+    Return a random puzzle equivalent to the given one, by relabelling the
+    digits, permuting bands, stacks and the rows and columns within them,
+    and transposing
+    """
+
+    generator = random.Random(seed)
+
+    def lines():
+        bands = generator.sample(range(3), 3)
+        return [3 * band + row for band in bands
+                for row in generator.sample(range(3), 3)]
+
+    rows, columns = lines(), lines()
+    labels = [0] + generator.sample(range(1, 10), 9)
+    values = parse(puzzle)
+    if generator.random() < 0.5:
+        values = [values[9 * c + r] for r in range(9) for c in range(9)]
+
+    return to_string(
+        labels[values[9 * r + c]] for r in rows for c in columns)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES)
+def test_equivalent_puzzles_share_a_canonical_form(puzzle):
+    canonical = canonical_form(puzzle)
+    assert canonical <= puzzle
+    for seed in range(5):
+        assert canonical_form(scramble(puzzle, seed)) == canonical
+
+
+def test_different_puzzles_have_different_forms():
+    assert len({canonical_form(puzzle) for puzzle in PUZZLES}) == len(PUZZLES)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES)
+def test_transform_round_trip(puzzle):
+    canonical, transform = canonicalise(puzzle)
+    assert transform.apply(puzzle) == canonical
+    assert transform.revert(canonical) == puzzle
+
+    solution = solve_string(puzzle)
+    moved = transform.apply(solution)
+    assert transform.revert(moved) == solution
+    assert to_string(dlx.solve(parse(canonical))) == moved
+
+    copied = pickle.loads(pickle.dumps(transform))
+    assert copied.revert(canonical) == puzzle
+
+
+def test_conflicting_givens():
+    puzzle = "11" + "0" * 79
+    with pytest.raises(ValueError):
+        canonicalise(puzzle)
+
+    assert cache_key(puzzle) == (None, None)
+
+
+def test_cache_answers_equivalent_puzzles():
+    cache = SolutionCache()
+    puzzle = PUZZLES[0]
+    assert cache.get(puzzle) is None
+    cache.put(puzzle, solve_string(puzzle))
+
+    for seed in range(5):
+        other = scramble(puzzle, seed)
+        assert cache.get(other) == solve_string(other)
+
+    assert (cache.hits, cache.misses) == (5, 1)
+    assert len(cache) == 1
+
+
+def test_cache_accepts_keys():
+    cache = SolutionCache()
+    puzzle = PUZZLES[1]
+    key = cache_key(puzzle)
+    cache.put(puzzle, solve_string(puzzle), key)
+    assert cache.get(puzzle, key) == solve_string(puzzle)
+
+
+def test_cache_skips_unsolved_and_conflicting_puzzles():
+    cache = SolutionCache()
+    cache.put(PUZZLES[0], None)
+    cache.put("11" + "0" * 79, "1" * 81)
+    assert len(cache) == 0
+    assert cache.get("11" + "0" * 79) is None
+
+
+def test_cache_discards_least_recently_used():
+    cache = SolutionCache(maxsize=2)
+    for puzzle in PUZZLES[:3]:
+        cache.put(puzzle, solve_string(puzzle))
+
+    assert len(cache) == 2
+    assert cache.get(PUZZLES[0]) is None
+    assert cache.get(PUZZLES[2]) == solve_string(PUZZLES[2])
+
+
+def test_cache_on_disk(tmp_path):
+    path = str(tmp_path / "solutions")
+    with SolutionCache(path=path) as cache:
+        for puzzle in PUZZLES[:3]:
+            cache.put(puzzle, solve_string(puzzle))
+
+    with SolutionCache(maxsize=1, path=path) as cache:
+        for puzzle in PUZZLES[:3]:
+            assert cache.get(scramble(puzzle, 1)) == solve_string(
+                scramble(puzzle, 1))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_many_with_cache(workers):
+    puzzles = [scramble(puzzle, seed) for seed in range(3)
+               for puzzle in PUZZLES]
+    cache = SolutionCache()
+    results = list(solve_many(
+        puzzles, workers=workers, chunksize=7, cache=cache))
+    assert results == [(puzzle, solve_string(puzzle)) for puzzle in puzzles]
+    assert len(cache) == len(PUZZLES)
+
+    again = list(solve_many(
+        puzzles, workers=workers, chunksize=7, cache=cache))
+    assert again == results
+    assert cache.hits >= len(puzzles)
@@ -0,0 +1,76 @@
+import itertools
+import random
+import pytest
+from pysudoku import boards, dlx
+from pysudoku.bench import load_corpus
+from pysudoku.grid import Grid, parse
+from pysudoku.search import Search
+from pysudoku.validation import validate
+
+PUZZLES = [puzzle for corpus in ("easy", "hard", "killers")
+           for puzzle in load_corpus(corpus)]
+
+
+def fewer_givens(puzzle, count, seed=0):
+    """
+    Return the values of a puzzle with some of its givens removed, so that
+    it usually has more than one solution
+    """
+
+    values = parse(puzzle)
+    givens = [index for index, value in enumerate(values) if value]
+    for index in random.Random(seed).sample(givens, count):
+        values[index] = 0
+
+    return values
+
+
+def assert_solves(values, solution):
+    assert 0 not in solution
+    assert validate(solution) == []
+    assert all(not given or given == value
+               for given, value in zip(values, solution))
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES)
+def test_solves_corpus(puzzle):
+    values = parse(puzzle)
+    solution = dlx.solve(values)
+    assert_solves(values, solution)
+    assert Grid(values).propagate() is not False
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_counts_agree_with_search(seed):
+    puzzle = PUZZLES[seed % len(PUZZLES)]
+    values = fewer_givens(puzzle, 2, seed)
+    found = list(itertools.islice(dlx.solutions(values), 200))
+    assert len(found) == Search().count(Grid(values), limit=200)
+    assert len({tuple(solution) for solution in found}) == len(found)
+    for solution in found:
+        assert_solves(values, solution)
+
+
+def test_conflicting_givens_have_no_solutions():
+    values = parse("11" + "0" * 79)
+    assert dlx.solve(values) is None
+    assert list(dlx.solutions(values)) == []
+
+
+def test_unsolvable_puzzle():
+    values = parse("012345678" + "9" + "0" * 71)
+    assert dlx.solve(values) is None
+    assert Search().count(Grid(values)) == 0
+
+
+@pytest.mark.parametrize("size", [4, 16])
+def test_other_sizes(size):
+    values = [0] * (size * size)
+    values[0] = 1
+    assert_solves(values, dlx.solve(values))
+
+
+def test_matches_sudoku_engine():
+    sudoku = boards.hard
+    assert sudoku.solve(engine="dlx")
+    assert sudoku.grid.values == dlx.solve(parse(boards.PUZZLES["hard"]))
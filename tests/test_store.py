@@ -0,0 +1,97 @@
+import random
+import pytest
+from pysudoku.bench import load_corpus
+from pysudoku.grid import parse, to_string
+from pysudoku.parallel import solve_many, solve_string
+from pysudoku.store import PACKED, SolutionStore, pack, unpack, write_store
+
+PUZZLES = [to_string(parse(puzzle)) for corpus in ("easy", "medium", "hard")
+           for puzzle in load_corpus(corpus)]
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    return list(solve_many(PUZZLES, workers=1))
+
+
+def test_pack_round_trip():
+    for puzzle in PUZZLES:
+        packed = pack(puzzle)
+        assert len(packed) == PACKED
+        assert unpack(packed) == puzzle
+
+    assert pack("." * 81) == pack("0" * 81)
+
+
+def test_pack_keeps_order():
+    ordered = sorted(PUZZLES)
+    assert sorted(ordered, key=pack) == ordered
+
+
+@pytest.mark.parametrize("puzzle", ["0" * 80, "x" * 81, "0" * 256])
+def test_pack_rejects_other_puzzles(puzzle):
+    with pytest.raises(ValueError):
+        pack(puzzle)
+
+
+def test_store_round_trip(tmp_path, pairs):
+    path = str(tmp_path / "solutions.store")
+    shuffled = pairs[:]
+    random.Random(0).shuffle(shuffled)
+    assert write_store(path, shuffled, runsize=7) == 0
+
+    with SolutionStore(path) as store:
+        assert len(store) == len(pairs)
+        assert list(store) == sorted(pairs)
+        for puzzle, solution in pairs:
+            assert puzzle in store
+            assert store.get(puzzle) == solution
+
+        assert store.get("0" * 81) is None
+        assert store.get("x") is None
+        assert (store.hits, store.misses) == (len(pairs), 2)
+
+
+def test_duplicates_and_skipped_puzzles(tmp_path, pairs):
+    path = str(tmp_path / "solutions.store")
+    extra = [(PUZZLES[0], None), ("0" * 80, "1" * 80),
+             ("x" * 81, "1" * 81)]
+    skipped = write_store(path, pairs + pairs[:5] + extra, runsize=3)
+    assert skipped == 2
+
+    with SolutionStore(path) as store:
+        assert len(store) == len(pairs)
+        assert list(store) == sorted(pairs)
+
+
+def test_runs_of_only_skipped_pairs(tmp_path, pairs):
+    path = str(tmp_path / "solutions.store")
+    write_store(path, [(PUZZLES[0], None)] * 5 + pairs[:3], runsize=2)
+    with SolutionStore(path) as store:
+        assert list(store) == sorted(pairs[:3])
+
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "empty.store")
+    write_store(path, [])
+    with SolutionStore(path) as store:
+        assert len(store) == 0
+        assert store.get(PUZZLES[0]) is None
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"not a store at all")
+    with pytest.raises(ValueError):
+        SolutionStore(str(path))
+
+
+def test_store_as_cache(tmp_path, pairs):
+    path = str(tmp_path / "solutions.store")
+    write_store(path, pairs[:20])
+    with SolutionStore(path) as store:
+        results = list(solve_many(PUZZLES, workers=1, cache=store))
+        assert results == pairs
+        assert store.hits == 20
+        store.put(PUZZLES[-1], solve_string(PUZZLES[-1]))
+        assert PUZZLES[-1] not in store
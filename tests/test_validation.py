@@ -0,0 +1,140 @@
+import random
+import sys
+import pytest
+from pysudoku import boards
+from pysudoku.board import Board
+from pysudoku.sudoku import Sudoku
+from pysudoku.validation import (
+    DUPLICATE, NO_CANDIDATES, NO_POSITION, SHAPE, VALUE, check, validate,
+    validate_many)
+
+EASY = boards.PUZZLES["easy"]
+
+
+def rows_of(puzzle):
+    values = [int(c) for c in puzzle]
+    return [values[r * 9:(r + 1) * 9] for r in range(9)]
+
+
+def kinds(problems):
+    return {problem.kind for problem in problems}
+
+
+@pytest.mark.parametrize("name", sorted(boards.PUZZLES))
+def test_valid_puzzles_have_no_problems(name):
+    puzzle = boards.PUZZLES[name]
+    assert validate(puzzle) == []
+    assert validate(rows_of(puzzle)) == []
+    assert validate(Board.from_string(puzzle)) == []
+    assert validate(Sudoku.from_string(puzzle)) == []
+    check(puzzle)
+
+
+def test_duplicate_givens_report_their_cells():
+    puzzle = "11" + "0" * 79
+    problems = validate(puzzle)
+    assert kinds(problems) == {DUPLICATE}
+    assert {problem.cells for problem in problems} == {(0, 1)}
+    assert {problem.message for problem in problems} == {
+        "1 is given more than once in row 0",
+        "1 is given more than once in square 0"}
+
+
+def test_out_of_range_values():
+    assert kinds(validate("x" + "0" * 80)) == {VALUE}
+
+    rows = rows_of("0" * 81)
+    rows[0][3] = 10
+    rows[4][4] = -1
+    problems = validate(rows)
+    assert kinds(problems) == {VALUE}
+    assert [problem.cells for problem in problems] == [(3,), (40,)]
+
+
+def test_booleans_are_not_values():
+    rows = rows_of("0" * 81)
+    rows[0][0] = True
+    assert kinds(validate(rows)) == {VALUE}
+
+
+def test_cells_with_no_candidates():
+    # The first cell can only be a 9, which is already in its column
+    puzzle = "012345678" + "9" + "0" * 71
+    problems = validate(puzzle)
+    assert (NO_CANDIDATES, (0,)) in {(p.kind, p.cells) for p in problems}
+    assert NO_POSITION in kinds(problems)
+    assert validate(puzzle, conflicts=False) == []
+
+
+def test_wrong_shapes():
+    assert kinds(validate("0" * 80)) == {SHAPE}
+    assert kinds(validate([[0] * 9] * 8 + [[0] * 10])) == {SHAPE}
+    assert kinds(validate([0] * 81, rows=True)) == {SHAPE}
+    assert validate([0] * 81) == []
+
+
+def test_check_raises_with_every_message():
+    with pytest.raises(ValueError) as error:
+        check("11" + "0" * 79)
+
+    assert "row 0" in str(error.value) and "square 0" in str(error.value)
+
+
+def test_sudoku_rejects_bad_puzzles_with_value_error():
+    for puzzle in ([0] * 81, "0" * 81, [[0] * 9] * 8 + [[0] * 10]):
+        with pytest.raises(ValueError):
+            Sudoku(puzzle)
+
+    rows = rows_of(EASY)
+    rows[0][1] = True
+    with pytest.raises(ValueError):
+        Sudoku(rows)
+
+
+def test_sudoku_accepts_rows_of_any_sequence():
+    rows = rows_of(EASY)
+    assert Sudoku([tuple(row) for row in rows]).to_string() == EASY
+    assert Sudoku([bytes(row) for row in rows]).to_string() == EASY
+
+
+def test_sudoku_accepts_numpy_arrays():
+    numpy = pytest.importorskip("numpy")
+    values = numpy.array([int(c) for c in EASY])
+    assert Sudoku(values.reshape(9, 9)).to_string() == EASY
+
+
+def corrupted_puzzles(count, seed=0):
+    """
+    Return a mix of valid puzzles and ones broken in each of the ways
+    validate reports
+    """
+
+    generator = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        puzzle = list(generator.choice(list(boards.PUZZLES.values())))
+        kind = generator.randrange(5)
+        if kind == 1:
+            puzzle[generator.randrange(81)] = generator.choice("123456789")
+        elif kind == 2:
+            puzzle[generator.randrange(81)] = generator.choice("x!A")
+        elif kind == 3:
+            del puzzle[generator.randrange(81)]
+        elif kind == 4:
+            puzzle = list("012345678" + "9" + "0" * 71)
+
+        puzzles.append("".join(puzzle))
+
+    return puzzles
+
+
+def test_validate_many_matches_validate():
+    pytest.importorskip("numpy")
+    puzzles = corrupted_puzzles(300)
+    assert validate_many(puzzles) == [validate(p) for p in puzzles]
+
+
+def test_validate_many_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pysudoku.batch", None)
+    puzzles = corrupted_puzzles(50, seed=1)
+    assert validate_many(puzzles) == [validate(p) for p in puzzles]